@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='user',
+            options={'permissions': [('can_check_plagiarism', 'Can check plagiarism'), ('can_check_plagiarism_paste', 'Can check plagiarism via paste text'), ('can_download_report', 'Can download plagiarism report'), ('can_batch_check', 'Can run batch plagiarism check'), ('can_view_repository', 'Can view repository'), ('can_add_repository', 'Can add to repository'), ('can_edit_repository', 'Can edit repository'), ('can_delete_repository', 'Can delete from repository'), ('can_index_repository', 'Can run repository indexing'), ('can_view_own_history', 'Can view own history'), ('can_view_all_history', 'Can view all users history'), ('can_manage_users', 'Can manage users'), ('can_manage_groups', 'Can manage groups'), ('can_change_settings', 'Can change system settings')], 'verbose_name': 'User', 'verbose_name_plural': 'Users'},
+        ),
+    ]
@@ -15,6 +15,7 @@ class User(AbstractUser):
             ('can_check_plagiarism', 'Can check plagiarism'),
             ('can_check_plagiarism_paste', 'Can check plagiarism via paste text'),
             ('can_download_report', 'Can download plagiarism report'),
+            ('can_batch_check', 'Can run batch plagiarism check'),
             
             # Repository Permissions
             ('can_view_repository', 'Can view repository'),
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='claimed_by',
+            field=models.CharField(blank=True, help_text='ID worker yang memproses', max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='input_path',
+            field=models.CharField(blank=True, help_text='File input yang menunggu diproses', max_length=500, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='plagiarismhistory',
+            index=models.Index(fields=['status', 'check_date'], name='plag_hist_queue_idx'),
+        ),
+    ]
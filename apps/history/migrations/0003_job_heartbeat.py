@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0002_job_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Sinyal hidup terakhir dari worker', null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0003_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='priority',
+            field=models.SmallIntegerField(default=5, help_text='Prioritas antrian (kecil = lebih dulu)'),
+        ),
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='queue_wait_seconds',
+            field=models.FloatField(blank=True, help_text='Lama menunggu di antrian sebelum diproses', null=True),
+        ),
+    ]
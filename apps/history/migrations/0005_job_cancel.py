@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0004_job_priority'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='cancel_requested',
+            field=models.BooleanField(default=False, help_text='User meminta pemeriksaan dihentikan'),
+        ),
+        migrations.AlterField(
+            model_name='plagiarismhistory',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Menunggu'), ('processing', 'Sedang Diproses'), ('completed', 'Selesai'), ('failed', 'Gagal'), ('cancelled', 'Dibatalkan')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:06
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0005_job_cancel'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlagiarismBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('source_mode', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('processing', 'Sedang Diproses'), ('completed', 'Selesai')], default='processing', max_length=20)),
+                ('total_files', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('summary_file', models.FileField(blank=True, null=True, upload_to='reports/')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Pemeriksaan Batch',
+                'verbose_name_plural': 'Pemeriksaan Batch',
+                'db_table': 'plagiarism_batch',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='plagiarismhistory',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='history.plagiarismbatch'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0006_plagiarism_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plagiarismbatch',
+            name='collusion_pairs',
+            field=models.TextField(blank=True, help_text='Pasangan dokumen batch yang mirip satu sama lain (JSON string)', null=True),
+        ),
+    ]
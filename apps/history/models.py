@@ -3,12 +3,58 @@ from django.conf import settings
 from django.utils import timezone
 import uuid
 
+class PlagiarismBatch(models.Model):
+    """Pemeriksaan massal (misal seluruh tugas satu kelas) dengan ringkasan gabungan"""
+    STATUS_CHOICES = [
+        ('processing', 'Sedang Diproses'),
+        ('completed', 'Selesai'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    name = models.CharField(max_length=255)
+    source_mode = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='processing')
+    total_files = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    summary_file = models.FileField(upload_to='reports/', null=True, blank=True)
+    collusion_pairs = models.TextField(null=True, blank=True, help_text="Pasangan dokumen batch yang mirip satu sama lain (JSON string)")
+    
+    class Meta:
+        db_table = 'plagiarism_batch'
+        verbose_name = "Pemeriksaan Batch"
+        verbose_name_plural = "Pemeriksaan Batch"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.name} ({self.total_files} file)"
+    
+    def get_collusion_pairs(self):
+        """
+        Parse JSON collusion pairs dari TextField
+        Returns list dict: a, b, a_name, b_name, jaccard, containment, shared
+        """
+        if self.collusion_pairs:
+            try:
+                import json
+                return json.loads(self.collusion_pairs)
+            except (json.JSONDecodeError, TypeError, ValueError):
+                return []
+        return []
+    
+    def set_collusion_pairs(self, pairs):
+        import json
+        self.collusion_pairs = json.dumps(pairs, ensure_ascii=False)
+
+
 class PlagiarismHistory(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Menunggu'),
         ('processing', 'Sedang Diproses'),
         ('completed', 'Selesai'),
         ('failed', 'Gagal'),
+        ('cancelled', 'Dibatalkan'),
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -36,6 +82,19 @@ class PlagiarismHistory(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
+    # Job queue (lihat apps.plagiarism.job_queue)
+    input_path = models.CharField(max_length=500, null=True, blank=True, help_text="File input yang menunggu diproses")
+    claimed_by = models.CharField(max_length=100, null=True, blank=True, help_text="ID worker yang memproses")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text="Sinyal hidup terakhir dari worker")
+    attempts = models.IntegerField(default=0)
+    priority = models.SmallIntegerField(default=5, help_text="Prioritas antrian (kecil = lebih dulu)")
+    queue_wait_seconds = models.FloatField(null=True, blank=True, help_text="Lama menunggu di antrian sebelum diproses")
+    cancel_requested = models.BooleanField(default=False, help_text="User meminta pemeriksaan dihentikan")
+    batch = models.ForeignKey(
+        PlagiarismBatch, null=True, blank=True, on_delete=models.CASCADE, related_name='items'
+    )
+    
     # File deletion tracking
     file_deleted = models.BooleanField(default=False)
     file_deleted_at = models.DateTimeField(null=True, blank=True)
@@ -46,6 +105,9 @@ class PlagiarismHistory(models.Model):
         verbose_name = "Histori Pemeriksaan"
         verbose_name_plural = "Histori Pemeriksaan"
         ordering = ['-check_date']
+        indexes = [
+            models.Index(fields=['status', 'check_date'], name='plag_hist_queue_idx'),
+        ]
 
     def __str__(self):
         return f"{self.filename} - {self.status} ({self.user.username})"
@@ -98,8 +160,17 @@ class UserUploadQuota(models.Model):
         quota.save()
         return quota.upload_count
     
+    @classmethod
+    def refund_quota(cls, user, date=None, count=1):
+        """Kembalikan kuota (misal job dibatalkan) pada tanggal upload"""
+        date = date or timezone.now().date()
+        return cls.objects.filter(user=user, date=date, upload_count__gte=count).update(
+            upload_count=models.F('upload_count') - count
+        )
+    
     @classmethod
     def get_remaining_quota(cls, user):
+        # Hanya baca: baris kuota dibuat saat upload pertama (increment_quota)
         today = timezone.now().date()
-        quota, created = cls.objects.get_or_create(user=user, date=today, defaults={'upload_count': 0})
-        return max(0, user.upload_limit - quota.upload_count)
\ No newline at end of file
+        used = cls.objects.filter(user=user, date=today).values_list('upload_count', flat=True).first()
+        return max(0, user.upload_limit - (used or 0))
\ No newline at end of file
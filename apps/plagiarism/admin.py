@@ -1,18 +1,31 @@
 from django.contrib import admin
 from django.urls import path
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, FileResponse
+from django.http import JsonResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.core.exceptions import PermissionDenied
 from django.conf import settings
+from django.db import transaction
 from django.contrib import messages
 from django.utils.html import format_html
+from django.core.handlers.asgi import ASGIRequest
+from asgiref.sync import sync_to_async
+import asyncio
+import json
 import os
+import time
 import uuid
-import docx
 
-from apps.history.models import PlagiarismHistory, UserUploadQuota
+from apps.history.models import PlagiarismBatch, PlagiarismHistory, UserUploadQuota
 from .models import PlagiarismSettings
-from .forms import PlagiarismCheckForm
+from .forms import BatchCheckForm, PlagiarismCheckForm
+from .batch import batch_counts, create_batch, stage_batch_files
 from .tasks import PlagiarismTask
+from .decorators import async_admin_view
+from .downloads import serve_file
+from .reporting import ReportRenderError, render_report
+from .job_queue import PRIORITY_HIGH, get_pool, request_cancel
+from .status import current_status, etag_matches, touch_status
+from .uploads import UploadRejected, discard_blobs, discard_job_file, store_upload
 
 @admin.register(PlagiarismSettings)
 class PlagiarismSettingsAdmin(admin.ModelAdmin):
@@ -51,7 +64,7 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
         'similarity_score', 'similarity_local', 'similarity_internet',
         'matched_sources_display',
         'filename', 'user', 'source_mode', 'status', 
-        'progress', 'error_message',
+        'progress', 'priority', 'queue_wait_seconds', 'cancel_requested', 'error_message',
         'file_deleted', 'file_deleted_at', 'file_deleted_reason'
     )
     
@@ -62,7 +75,7 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
             'fields': ('filename', 'user', 'check_date', 'source_mode')
         }),
         ('Status Pemrosesan', {
-            'fields': ('status', 'progress', 'started_at', 'completed_at', 'error_message')
+            'fields': ('status', 'progress', 'priority', 'queue_wait_seconds', 'cancel_requested', 'started_at', 'completed_at', 'error_message')
         }),
         ('Hasil Deteksi', {
             'fields': ('similarity_score', 'similarity_local', 'similarity_internet', 'matched_sources_display')
@@ -215,12 +228,22 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
+            # Upload: view sync biasa (di ASGI dijalankan Django di thread).
+            # Status/stream/download async: klien yang menunggu tidak menahan thread
             path('start-check/', self.admin_site.admin_view(self.plagiarism_check_view), 
                  name='plagiarism_check_tool'),
-            path('check-status/', self.admin_site.admin_view(self.check_status), 
+            path('check-status/', async_admin_view(self.admin_site, self.check_status), 
                  name='plagiarism_check_status'),
-            path('download-report/<uuid:history_id>/', self.admin_site.admin_view(self.download_report), 
+            path('download-report/<uuid:history_id>/', async_admin_view(self.admin_site, self.download_report, cacheable=True), 
                  name='plagiarism_download_report'),
+            path('status-stream/', async_admin_view(self.admin_site, self.status_stream), 
+                 name='plagiarism_status_stream'),
+            path('cancel-check/<uuid:history_id>/', self.admin_site.admin_view(self.cancel_check), 
+                 name='plagiarism_cancel_check'),
+            path('batch-check/', self.admin_site.admin_view(self.batch_check_view), 
+                 name='plagiarism_batch_check'),
+            path('batch-summary/<uuid:batch_id>/', self.admin_site.admin_view(self.download_batch_summary, cacheable=True), 
+                 name='plagiarism_batch_summary'),
         ]
         return custom_urls + urls
 
@@ -239,15 +262,24 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
         return super().get_form(request, obj, **kwargs)
 
     def plagiarism_check_view(self, request):
+        """
+        View sync: parsing form, penyimpanan file, dan akses ORM semuanya
+        blocking, jadi di ASGI seluruh view berjalan di thread (sama seperti
+        view sync lain). Body upload sudah dibaca handler ASGI sebelum view.
+        """
+        # Pastikan worker pool berjalan agar job yang tertinggal (restart) dilanjutkan
+        get_pool()
+        
         context = dict(self.admin_site.each_context(request))
         
         # Check quota
         remaining_quota = UserUploadQuota.get_remaining_quota(request.user)
         context['remaining_quota'] = remaining_quota
         
-        # Check active process
+        # Check active process (item batch tidak dihitung)
         active_process = PlagiarismHistory.objects.filter(
             user=request.user,
+            batch__isnull=True,
             status__in=['pending', 'processing']
         ).first()
         
@@ -277,14 +309,13 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
                             messages.error(request, "❌ Tidak ada file yang diupload.")
                             return redirect('admin:plagiarism_check_tool')
                         
-                        if len(uploaded_files) > remaining_quota:
-                            messages.error(
-                                request, 
-                                f"❌ Kuota harian Anda: {remaining_quota}. "
-                                f"Tidak bisa upload {len(uploaded_files)} file."
-                            )
+                        if remaining_quota < 1:
+                            messages.error(request, "❌ Kuota harian Anda habis.")
                             return redirect('admin:plagiarism_check_tool')
                         
+                        seen = set()
+                        stored = []      # blob CAS dari upload ini (dihapus jika ditolak)
+                        over_quota = 0   # file valid di luar kuota (tidak disimpan)
                         for uploaded_file in uploaded_files:
                             file_ext = os.path.splitext(uploaded_file.name)[1].lower()
                             
@@ -303,22 +334,43 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
                                 )
                                 continue
                             
-                            safe_filename = self._sanitize_filename(uploaded_file.name)
-                            temp_filename = f"{uuid.uuid4()}{file_ext}"
-                            temp_path = os.path.join(temp_dir, temp_filename)
+                            if len(files_to_process) >= remaining_quota:
+                                # Upload pasti ditolak: cukup dihitung, jangan disimpan ke CAS
+                                over_quota += 1
+                                continue
                             
+                            # Stream ke CAS: hash + cek magic bytes dalam satu pass,
+                            # sekaligus membuat file input job (link ke blob)
                             try:
-                                with open(temp_path, 'wb+') as destination:
-                                    for chunk in uploaded_file.chunks():
-                                        destination.write(chunk)
-                                
-                                files_to_process.append({
-                                    'filename': safe_filename,
-                                    'temp_path': temp_path
-                                })
-                            except Exception as e:
-                                messages.error(request, f"❌ Error: {str(e)}")
+                                blob = store_upload(uploaded_file, link_dir=temp_dir)
+                            except UploadRejected as e:
+                                messages.warning(request, f"⚠️ {e} File diabaikan.")
+                                continue
+                            stored.append(blob)
+                            
+                            if blob['sha256'] in seen:
+                                discard_job_file(blob)
+                                messages.warning(
+                                    request,
+                                    f"⚠️ File '{uploaded_file.name}' sama dengan file lain di upload ini (diabaikan)."
+                                )
                                 continue
+                            seen.add(blob['sha256'])
+                            
+                            files_to_process.append({
+                                'filename': self._sanitize_filename(uploaded_file.name),
+                                'temp_path': blob['job_path'],
+                            })
+                        
+                        # Kuota dihitung dari file yang lolos validasi
+                        if over_quota:
+                            discard_blobs(stored)
+                            messages.error(
+                                request, 
+                                f"❌ Kuota harian Anda: {remaining_quota}. "
+                                f"Tidak bisa upload {len(files_to_process) + over_quota} file."
+                            )
+                            return redirect('admin:plagiarism_check_tool')
                     
                     else:  # text input
                         if remaining_quota < 1:
@@ -334,6 +386,8 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
                         temp_path = os.path.join(temp_dir, f"{uuid.uuid4()}.docx")
                         
                         try:
+                            import docx  # lazy: hanya untuk input paste text
+                            
                             doc = docx.Document()
                             for paragraph in raw_text.split('\n'):
                                 if paragraph.strip():
@@ -342,7 +396,8 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
                             
                             files_to_process.append({
                                 'filename': "pasted_text.docx",
-                                'temp_path': temp_path
+                                'temp_path': temp_path,
+                                'priority': PRIORITY_HIGH
                             })
                         except Exception as e:
                             messages.error(request, f"❌ Error: {str(e)}")
@@ -352,21 +407,33 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
                         messages.error(request, "❌ Tidak ada file valid.")
                         return redirect('admin:plagiarism_check_tool')
                     
-                    UserUploadQuota.increment_quota(request.user, len(files_to_process))
+                    # Semua file input sudah ada; riwayat + kuota ditulis bersama
+                    try:
+                        with transaction.atomic():
+                            histories = [
+                                PlagiarismHistory.objects.create(
+                                    user=request.user,
+                                    filename=file_info['filename'],
+                                    source_mode=source_mode,
+                                    status='pending',
+                                    progress=0
+                                )
+                                for file_info in files_to_process
+                            ]
+                            UserUploadQuota.increment_quota(request.user, len(files_to_process))
+                    except Exception:
+                        for file_info in files_to_process:
+                            if os.path.exists(file_info['temp_path']):
+                                os.remove(file_info['temp_path'])
+                        discard_blobs(stored)
+                        raise
                     
-                    for file_info in files_to_process:
-                        history = PlagiarismHistory.objects.create(
-                            user=request.user,
-                            filename=file_info['filename'],
-                            source_mode=source_mode,
-                            status='pending',
-                            progress=0
-                        )
-                        
+                    for history, file_info in zip(histories, files_to_process):
                         PlagiarismTask.process_document(
                             history.id,
                             file_info['temp_path'],
-                            source_mode
+                            source_mode,
+                            file_info.get('priority')
                         )
                     
                     messages.success(
@@ -385,6 +452,7 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
             form = PlagiarismCheckForm()
 
         context['form'] = form
+        context['status_stream'] = getattr(settings, 'PLAGIARISM_STATUS_STREAM', True)
         context['title'] = "Alat Cek Plagiasi Dokumen"
         return render(request, 'admin/plagiarism/check_plagiarism.html', context)
 
@@ -397,53 +465,99 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
             filename = name[:190] + ext
         return filename
 
-    def check_status(self, request):
-        active_process = PlagiarismHistory.objects.filter(
-            user=request.user,
-            status__in=['pending', 'processing']
-        ).first()
+    async def check_status(self, request):
+        await sync_to_async(get_pool)()
         
-        recent_processes = PlagiarismHistory.objects.filter(
-            user=request.user
-        ).order_by('-check_date')[:5]
-        
-        data = {
-            'has_active': bool(active_process),
-            'remaining_quota': UserUploadQuota.get_remaining_quota(request.user),
-            'processes': []
-        }
-        
-        for process in recent_processes:
-            data['processes'].append({
-                'id': str(process.id),
-                'filename': process.filename,
-                'status': process.status,
-                'progress': process.progress,
-                'similarity_score': process.similarity_score,
-                'error_message': process.error_message,
-                'file_deleted': process.file_deleted,
-                'file_deleted_reason': process.file_deleted_reason,
-                'can_download': bool(
-                    process.status == 'completed' 
-                    and process.report_file 
-                    and not process.file_deleted
-                    and os.path.exists(process.report_file.path)
-                )
-            })
+        # Dibaca dari snapshot di cache (tanpa database selama tidak ada perubahan)
+        etag, data = await sync_to_async(current_status)(request.user)
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            response = HttpResponseNotModified()
+            response['ETag'] = f'"{etag}"'
+            return response
+        
+        response = JsonResponse(data)
+        response['ETag'] = f'"{etag}"'
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+    
+    async def status_stream(self, request):
+        """
+        Server-sent events: kirim status hanya saat snapshot status user berubah.
+        Stream ditutup setelah PLAGIARISM_STATUS_STREAM_SECONDS; EventSource
+        menyambung ulang dengan Last-Event-ID sehingga tidak ada payload
+        ganda jika status belum berubah.
+        
+        Di ASGI stream berupa async generator (menunggu dengan asyncio.sleep,
+        tanpa thread); di WSGI tetap generator biasa karena Django menampung
+        seluruh isi async iterator sebelum mengirimnya.
+        """
+        if not getattr(settings, 'PLAGIARISM_STATUS_STREAM', True):
+            return JsonResponse({'error': 'Status stream dinonaktifkan'}, status=404)
+        
+        await sync_to_async(get_pool)()
+        user = request.user
+        last_event_id = request.headers.get('Last-Event-ID')
+        duration = getattr(settings, 'PLAGIARISM_STATUS_STREAM_SECONDS', 55)
+        poll = getattr(settings, 'PLAGIARISM_STATUS_STREAM_POLL', 1.0)
+        keepalive = 15
+        
+        def poll_status():
+            from django.db import connection
+            
+            etag, data = current_status(user)
+            # Jangan tahan koneksi database selama menunggu perubahan
+            connection.close()
+            return etag, data
+        
+        def event(etag, data):
+            from django.core.serializers.json import DjangoJSONEncoder
+            
+            return f"id: {etag}\nevent: status\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+        
+        async def async_events():
+            last = last_event_id
+            deadline = time.monotonic() + duration
+            idle = 0.0
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                # Thread sync milik request ini (ThreadSensitiveContext per request di ASGI)
+                etag, data = await sync_to_async(poll_status)()
+                if not etag_matches(last, etag):
+                    last = etag
+                    yield event(etag, data)
+                    idle = 0.0
+                elif idle >= keepalive:
+                    yield ": ping\n\n"
+                    idle = 0.0
+                await asyncio.sleep(poll)
+                idle += poll
+        
+        def sync_events():
+            last = last_event_id
+            deadline = time.monotonic() + duration
+            idle = 0.0
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                etag, data = poll_status()
+                if not etag_matches(last, etag):
+                    last = etag
+                    yield event(etag, data)
+                    idle = 0.0
+                elif idle >= keepalive:
+                    yield ": ping\n\n"
+                    idle = 0.0
+                time.sleep(poll)
+                idle += poll
         
-        return JsonResponse(data)
+        events = async_events() if isinstance(request, ASGIRequest) else sync_events()
+        response = StreamingHttpResponse(events, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx: jangan buffer stream
+        return response
   
-    def download_report(self, request, history_id):
+    async def download_report(self, request, history_id):
         try:
-            history = PlagiarismHistory.objects.get(id=history_id, user=request.user)
-            
-            if history.file_deleted:
-                messages.error(
-                    request, 
-                    f"❌ File sudah dihapus pada {history.file_deleted_at.strftime('%d-%m-%Y')}. "
-                    f"Alasan: {history.file_deleted_reason}"
-                )
-                return redirect('admin:plagiarism_check_tool')
+            history = await PlagiarismHistory.objects.aget(id=history_id, user=request.user)
             
             if history.status != 'completed' or not history.report_file:
                 messages.error(request, "Laporan belum tersedia")
@@ -452,25 +566,147 @@ class PlagiarismHistoryAdmin(admin.ModelAdmin):
             file_path = history.report_file.path
             
             if not os.path.exists(file_path):
+                # PDF dirender saat pertama diunduh, atau ulang jika sudah dibersihkan
+                try:
+                    file_path = await sync_to_async(render_report)(history)
+                except ReportRenderError as e:
+                    # Data laporan masih ada: jangan tandai file_deleted, user bisa coba lagi
+                    print(f"❌ {e}")
+                    messages.error(request, "❌ Gagal membuat laporan PDF. Silakan coba unduh lagi beberapa saat lagi.")
+                    return redirect('admin:plagiarism_check_tool')
+            
+            if file_path is None:
+                if history.file_deleted:
+                    messages.error(
+                        request, 
+                        f"❌ File sudah dihapus pada {history.file_deleted_at.strftime('%d-%m-%Y')}. "
+                        f"Alasan: {history.file_deleted_reason}"
+                    )
+                    return redirect('admin:plagiarism_check_tool')
+                
                 from django.utils import timezone
                 history.file_deleted = True
                 history.file_deleted_at = timezone.now()
                 history.file_deleted_reason = 'File not found'
-                history.save()
+                await history.asave(update_fields=['file_deleted', 'file_deleted_at', 'file_deleted_reason'])
+                await sync_to_async(touch_status)(request.user)
                 
                 messages.error(request, "File laporan tidak ditemukan")
                 return redirect('admin:plagiarism_check_tool')
             
             filename = f"RESULT_{os.path.splitext(history.filename)[0]}.pdf"
-            
-            response = FileResponse(
-                open(file_path, 'rb'),
-                as_attachment=True,
-                filename=filename,
-                content_type='application/pdf'
-            )
-            return response
+            return serve_file(request, file_path, filename)
             
         except PlagiarismHistory.DoesNotExist:
             messages.error(request, "Laporan tidak ditemukan")
-            return redirect('admin:plagiarism_check_tool')
\ No newline at end of file
+            return redirect('admin:plagiarism_check_tool')
+
+    def cancel_check(self, request, history_id):
+        """Batalkan job milik user (POST). Balas JSON untuk request AJAX."""
+        is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
+        
+        if request.method != 'POST':
+            return JsonResponse({'error': 'Method not allowed'}, status=405)
+        
+        try:
+            history = PlagiarismHistory.objects.get(id=history_id, user=request.user)
+        except PlagiarismHistory.DoesNotExist:
+            if is_ajax:
+                return JsonResponse({'error': 'Proses tidak ditemukan'}, status=404)
+            messages.error(request, "Proses tidak ditemukan")
+            return redirect('admin:plagiarism_check_tool')
+        
+        result = request_cancel(history)
+        
+        if result == 'cancelled':
+            message = f"🛑 Pemeriksaan '{history.filename}' dibatalkan. Kuota dikembalikan."
+        elif result == 'cancelling':
+            message = f"🛑 Pemeriksaan '{history.filename}' sedang dihentikan..."
+        else:
+            message = "⚠️ Proses sudah selesai dan tidak bisa dibatalkan."
+        
+        if is_ajax:
+            return JsonResponse({'status': result, 'message': message}, status=200 if result else 409)
+        
+        if result:
+            messages.success(request, message)
+        else:
+            messages.warning(request, message)
+        return redirect('admin:plagiarism_check_tool')
+
+    def batch_check_view(self, request):
+        """Upload banyak dokumen / zip sekaligus (tanpa kuota harian)"""
+        if not request.user.has_perm('accounts.can_batch_check'):
+            raise PermissionDenied
+        get_pool()
+        
+        if request.method == 'POST':
+            form = BatchCheckForm(request.POST, request.FILES)
+            if form.is_valid():
+                temp_dir = os.path.join(settings.MEDIA_ROOT, 'temp')
+                files, skipped = stage_batch_files(form.cleaned_data['batch_files'], temp_dir)
+                
+                for message in skipped:
+                    messages.warning(request, f"⚠️ {message}")
+                
+                if not files:
+                    messages.error(request, "❌ Tidak ada dokumen valid di dalam upload.")
+                    return redirect('admin:plagiarism_batch_check')
+                
+                batch = create_batch(
+                    request.user,
+                    form.cleaned_data['name'],
+                    form.cleaned_data['source_mode'],
+                    files
+                )
+                messages.success(
+                    request,
+                    f"✅ Batch '{batch.name}': {len(files)} dokumen masuk antrian."
+                )
+                return redirect('admin:plagiarism_batch_check')
+            
+            for field, errors in form.errors.items():
+                for error in errors:
+                    messages.error(request, f"{field}: {error}")
+        else:
+            form = BatchCheckForm()
+        
+        batches = []
+        for batch in PlagiarismBatch.objects.filter(user=request.user)[:20]:
+            counts = batch_counts(batch)
+            finished = sum(counts.get(status, 0) for status in ('completed', 'failed', 'cancelled'))
+            batches.append({
+                'batch': batch,
+                'counts': counts,
+                'finished': finished,
+                'percent': int(finished * 100 / batch.total_files) if batch.total_files else 100,
+                'collusion': len(batch.get_collusion_pairs()),
+            })
+        
+        context = dict(self.admin_site.each_context(request))
+        context.update({
+            'form': form,
+            'batches': batches,
+            'has_running': any(b['batch'].status == 'processing' for b in batches),
+            'title': "Pemeriksaan Batch",
+        })
+        return render(request, 'admin/plagiarism/batch_check.html', context)
+
+    def download_batch_summary(self, request, batch_id):
+        if not request.user.has_perm('accounts.can_batch_check'):
+            raise PermissionDenied
+        
+        batches = PlagiarismBatch.objects.all()
+        if not (request.user.is_superuser or request.user.has_perm('accounts.can_view_all_history')):
+            batches = batches.filter(user=request.user)
+        batch = batches.filter(id=batch_id).first()
+        
+        if batch is None or not batch.summary_file or not os.path.exists(batch.summary_file.path):
+            messages.error(request, "Ringkasan batch belum tersedia")
+            return redirect('admin:plagiarism_batch_check')
+        
+        return serve_file(
+            request,
+            batch.summary_file.path,
+            f"BATCH_{self._sanitize_filename(batch.name)}.pdf",
+        )
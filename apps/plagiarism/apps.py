@@ -1,5 +1,35 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _is_server_process():
+    """
+    True untuk proses web server (gunicorn/uvicorn/daphne/mod_wsgi, atau
+    runserver di proses anak autoreloader). Management command lain
+    (migrate, test, shell, run_plagiarism_worker, ...) tidak menjalankan pool.
+    """
+    if len(sys.argv) > 1 and os.path.basename(sys.argv[0]) in ('manage.py', 'django-admin'):
+        if sys.argv[1] != 'runserver':
+            return False
+        return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+    return True
+
 
 class PlagiarismConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.plagiarism' # <-- Ubah ini
\ No newline at end of file
+    name = 'apps.plagiarism' # <-- Ubah ini
+
+    def ready(self):
+        # Mode 'thread': worker pool jalan sejak proses web start, sehingga job
+        # pending / hasil requeue langsung diproses tanpa menunggu halaman dibuka
+        if (
+            getattr(settings, 'PLAGIARISM_WORKER_MODE', 'thread') == 'thread'
+            and getattr(settings, 'PLAGIARISM_WORKER_AUTOSTART', True)
+            and _is_server_process()
+        ):
+            from apps.plagiarism.job_queue import start_pool_in_background
+
+            start_pool_in_background()
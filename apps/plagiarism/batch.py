@@ -0,0 +1,304 @@
+"""
+Pemeriksaan batch: banyak dokumen (zip / multi-upload) dalam satu permintaan.
+
+- Setiap file menjadi satu ``PlagiarismHistory`` biasa (terhubung ke
+  ``PlagiarismBatch``) yang diproses worker pool dengan prioritas rendah,
+  sehingga batch besar tidak menahan pemeriksaan user lain.
+- Batch tidak memakai kuota harian dan aturan satu-proses-aktif (hanya
+  untuk user dengan permission ``accounts.can_batch_check``).
+- Hasil pencarian kandidat per kalimat dibagi antar dokumen dalam batch
+  (``BatchSentenceCache``): kalimat yang sama (template tugas, soal, kutipan
+  umum) cukup dicari sekali. Dokumen yang identik memakai ulang hasil lewat
+  ``result_cache``.
+- Setelah semua file selesai, worker terakhir membandingkan dokumen batch
+  satu sama lain (``collusion``) dan membuat satu laporan ringkasan.
+"""
+import hashlib
+import json
+import os
+import uuid
+import zipfile
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.history.models import PlagiarismBatch, PlagiarismHistory
+from apps.plagiarism.collusion import compute_batch_collusion
+from apps.plagiarism.models import BatchSentenceResult
+from apps.plagiarism.status import touch_status
+from apps.plagiarism.uploads import CHUNK_SIZE, UploadRejected, store_stream
+from apps.repository.models import RepositoryFile
+
+BATCH_EXTENSIONS = ('.pdf', '.docx')
+ACTIVE_STATUSES = ('pending', 'processing')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _sanitize_filename(filename):
+    import re
+
+    filename = os.path.basename(filename.replace('\\', '/'))
+    filename = re.sub(r'[^\w\s\-\.]', '', filename)
+    if len(filename) > 200:
+        name, ext = os.path.splitext(filename)
+        filename = name[:190] + ext
+    return filename
+
+
+def _read_chunks(source, size=CHUNK_SIZE):
+    while True:
+        chunk = source.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def stage_batch_files(uploaded_files, temp_dir):
+    """
+    Simpan file upload (PDF/DOCX langsung, atau isi file .zip) ke CAS lalu
+    buat file input job di ``temp_dir``. File rusak ditolak (``uploads``).
+    Returns: (files, skipped) — files = [{'filename', 'temp_path'}],
+    skipped = daftar pesan file yang diabaikan.
+    """
+    max_files = _setting('PLAGIARISM_BATCH_MAX_FILES', 300)
+    max_file_size = 10 * 1024 * 1024
+    max_total = _setting('PLAGIARISM_BATCH_MAX_UPLOAD_BYTES', 500 * 1024 * 1024)
+    os.makedirs(temp_dir, exist_ok=True)
+
+    files, skipped = [], []
+    total = 0
+
+    def accept(name, size, open_source):
+        nonlocal total
+        ext = os.path.splitext(name)[1].lower()
+        if ext not in BATCH_EXTENSIONS:
+            skipped.append(f"'{name}' diabaikan (format tidak didukung)")
+            return
+        if size > max_file_size:
+            skipped.append(f"'{name}' diabaikan (lebih dari 10MB)")
+            return
+        if len(files) >= max_files:
+            skipped.append(f"'{name}' diabaikan (batas {max_files} file per batch)")
+            return
+        if total + size > max_total:
+            skipped.append(f"'{name}' diabaikan (total ukuran batch melebihi batas)")
+            return
+
+        # File identik TIDAK digabung: submission kembar adalah bukti kolusi
+        try:
+            with open_source() as source:
+                blob = store_stream(_read_chunks(source), name, ext, link_dir=temp_dir)
+        except UploadRejected as e:
+            skipped.append(f"{e} Diabaikan.")
+            return
+        total += size
+        files.append({
+            'filename': _sanitize_filename(name),
+            'temp_path': blob['job_path'],
+        })
+
+    for uploaded in uploaded_files:
+        if os.path.splitext(uploaded.name)[1].lower() != '.zip':
+            accept(uploaded.name, uploaded.size, lambda f=uploaded: f.open('rb'))
+            continue
+
+        try:
+            with zipfile.ZipFile(uploaded) as archive:
+                for info in archive.infolist():
+                    name = info.filename
+                    base = os.path.basename(name.rstrip('/'))
+                    if info.is_dir() or name.startswith('__MACOSX/') or base.startswith(('.', '~$')):
+                        continue
+                    # Ukuran dari header zip (file_size = ukuran setelah dekompresi)
+                    accept(base, info.file_size, lambda i=info, a=archive: a.open(i))
+        except zipfile.BadZipFile:
+            skipped.append(f"'{uploaded.name}' diabaikan (file zip rusak)")
+
+    return files, skipped
+
+
+def create_batch(user, name, source_mode, files):
+    """Buat batch + satu job per file lalu masukkan ke antrian (prioritas rendah)"""
+    from apps.plagiarism.job_queue import PRIORITY_LOW, get_pool
+
+    batch = PlagiarismBatch.objects.create(
+        user=user,
+        name=name,
+        source_mode=source_mode,
+        total_files=len(files),
+    )
+    # Semua item masuk dalam satu INSERT, sehingga batch tidak pernah terlihat
+    # "selesai" oleh worker sebelum seluruh item tercatat
+    PlagiarismHistory.objects.bulk_create([
+        PlagiarismHistory(
+            user=user,
+            batch=batch,
+            filename=file_info['filename'],
+            source_mode=source_mode,
+            status='pending',
+            progress=0,
+            input_path=file_info['temp_path'],
+            priority=PRIORITY_LOW,
+        )
+        for file_info in files
+    ])
+    touch_status(user, queue=True)
+    pool = get_pool()
+    if pool is not None:
+        pool.notify()
+    return batch
+
+
+def batch_counts(batch):
+    """Jumlah item per status, misal {'completed': 10, 'pending': 5}"""
+    return dict(batch.items.values('status').annotate(n=Count('id')).values_list('status', 'n'))
+
+
+class BatchSentenceCache:
+    """
+    Cache hasil pemeriksaan per kalimat yang dibagi antar dokumen dalam
+    satu batch (tabel ``BatchSentenceResult``, lintas worker). Disimpan di
+    database, bukan di ``CACHES['plagiarism']``: ribuan kalimat per batch
+    akan memicu culling cache file dan ikut membuang key status/progress.
+    """
+
+    def __init__(self, batch_id, source_mode, threshold):
+        self.batch_id = batch_id
+        self.prefix = f"{source_mode}:{threshold}:"
+        self._repos = {}
+
+    def _key(self, sentence):
+        return self.prefix + hashlib.blake2b(sentence.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _repo(self, repo_id):
+        if repo_id not in self._repos:
+            self._repos[repo_id] = RepositoryFile.objects.filter(id=repo_id).first()
+        return self._repos[repo_id]
+
+    def get(self, sentence):
+        """Returns (score_local, repo_file, score_internet, url) atau None"""
+        payload = BatchSentenceResult.objects.filter(
+            batch_id=self.batch_id, key=self._key(sentence)
+        ).values_list('payload', flat=True).first()
+        if payload is None:
+            return None
+        score_local, repo_id, score_internet, url = json.loads(payload)
+        return score_local, self._repo(repo_id) if repo_id else None, score_internet, url
+
+    def set(self, sentence, outcome):
+        score_local, repo, score_internet, url = outcome
+        payload = json.dumps([score_local, str(repo.id) if repo else None, score_internet, url])
+        # Dokumen lain di batch mungkin sudah menyimpan kalimat yang sama
+        BatchSentenceResult.objects.bulk_create(
+            [BatchSentenceResult(batch_id=self.batch_id, key=self._key(sentence), payload=payload)],
+            ignore_conflicts=True,
+        )
+
+
+def finalize_batch(batch_id):
+    """
+    Dipanggil setiap kali item batch selesai (completed/failed/cancelled).
+    Item terakhir membuat laporan ringkasan dan menandai batch selesai.
+    Returns True jika batch baru saja diselesaikan oleh pemanggil ini.
+    """
+    if PlagiarismHistory.objects.filter(batch_id=batch_id, status__in=ACTIVE_STATUSES).exists():
+        return False
+
+    # Claim atomik: hanya satu worker yang membuat ringkasan
+    claimed = PlagiarismBatch.objects.filter(id=batch_id, status='processing', completed_at__isnull=True).update(
+        completed_at=timezone.now()
+    )
+    if not claimed:
+        return False
+
+    BatchSentenceResult.objects.filter(batch_id=batch_id).delete()
+
+    batch = PlagiarismBatch.objects.get(id=batch_id)
+    try:
+        compute_batch_collusion(batch)
+    except Exception as e:
+        print(f"❌ Gagal membandingkan dokumen batch {batch.id}: {e}")
+
+    reports_dir = os.path.join(settings.MEDIA_ROOT, 'reports')
+    os.makedirs(reports_dir, exist_ok=True)
+    summary_name = f"Batch_{uuid.uuid4()}.pdf"
+
+    try:
+        generate_batch_summary(batch, os.path.join(reports_dir, summary_name))
+        batch.summary_file = f"reports/{summary_name}"
+        print(f"📚 Batch summary created: {batch.name} ({summary_name})")
+    except Exception as e:
+        print(f"❌ Gagal membuat ringkasan batch {batch.id}: {e}")
+
+    batch.status = 'completed'
+    batch.save(update_fields=['status', 'summary_file'])
+    return True
+
+
+def summarize_batch(batch):
+    """
+    Statistik gabungan batch untuk laporan ringkasan. Hanya tipe dasar
+    (tanpa objek model), agar bisa dikirim ke process pool render.
+    """
+    from apps.plagiarism.models import PlagiarismSettings
+
+    threshold = PlagiarismSettings.get_threshold()
+    items = list(batch.items.order_by('filename'))
+    completed = [item for item in items if item.status == 'completed']
+    scores = [item.similarity_score or 0 for item in completed]
+
+    local_sources = {}
+    internet_sources = {}
+    for item in completed:
+        sources = item.get_matched_sources()
+        for src in sources.get('local', []):
+            entry = local_sources.setdefault(str(src.get('id')), {
+                'title': src.get('title', 'Unknown'), 'documents': 0, 'sentences': 0,
+            })
+            entry['documents'] += 1
+            entry['sentences'] += src.get('count', 0)
+        for url in sources.get('internet', []):
+            internet_sources[url] = internet_sources.get(url, 0) + 1
+
+    buckets = [('0-24%', 0, 24), ('25-49%', 25, 49), ('50-74%', 50, 74), ('75-100%', 75, 100)]
+    return {
+        'name': batch.name,
+        'checker': batch.user.get_full_name() or batch.user.username,
+        'created_at': timezone.localtime(batch.created_at).strftime('%d-%m-%Y %H:%M'),
+        'source_mode': batch.source_mode,
+        'items': [
+            {
+                'filename': item.filename,
+                'status': item.get_status_display(),
+                'done': item.status == 'completed',
+                'similarity_score': item.similarity_score,
+                'similarity_local': item.similarity_local or 0,
+                'similarity_internet': item.similarity_internet or 0,
+            }
+            for item in items
+        ],
+        'threshold': threshold,
+        'completed': len(completed),
+        'failed': sum(1 for item in items if item.status == 'failed'),
+        'cancelled': sum(1 for item in items if item.status == 'cancelled'),
+        'average': round(sum(scores) / len(scores), 1) if scores else 0,
+        'maximum': max(scores) if scores else 0,
+        'flagged': sum(1 for score in scores if score >= threshold),
+        'distribution': [(label, sum(1 for s in scores if low <= s <= high)) for label, low, high in buckets],
+        'top_local': sorted(local_sources.values(), key=lambda s: (-s['documents'], -s['sentences']))[:10],
+        'top_internet': sorted(internet_sources.items(), key=lambda kv: -kv[1])[:10],
+        'collusion': batch.get_collusion_pairs(),
+    }
+
+
+def generate_batch_summary(batch, output_path):
+    """Render laporan ringkasan batch (process pool render, lihat reporting)"""
+    from apps.plagiarism.reporting import ReportRenderError, render_batch_summary
+
+    if render_batch_summary(output_path, summarize_batch(batch)) is None:
+        raise ReportRenderError(f"Render ringkasan batch gagal: {batch.name}")
+    return output_path
@@ -0,0 +1,70 @@
+"""
+Checkpoint per potongan kalimat untuk pemeriksaan yang bisa dilanjutkan.
+
+Setiap potongan (PLAGIARISM_CHECK_CHUNK_SIZE kalimat) yang selesai diperiksa
+disimpan sebagai satu baris ``CheckCheckpoint``. Jika worker mati dan job
+dikembalikan ke antrian (``job_queue.reap_stale_jobs``), worker berikutnya
+hanya memeriksa potongan yang belum punya checkpoint.
+
+Checkpoint hanya dipakai jika fingerprint-nya cocok (teks dokumen, threshold,
+mode sumber, ukuran potongan, dan versi index repository sama); sisanya
+dianggap basi dan dihapus.
+Semua checkpoint job dihapus setelah job selesai atau gagal.
+"""
+import hashlib
+import json
+
+from apps.plagiarism.models import CheckCheckpoint
+from apps.repository.models import RepositoryFile
+
+
+def clear_checkpoints(history_id):
+    CheckCheckpoint.objects.filter(history_id=history_id).delete()
+
+
+class CheckpointStore:
+
+    def __init__(self, history_id, document, threshold, source_mode, chunk_size, index_version):
+        """index_version: result_cache.index_version() saat job dimulai"""
+        self.history_id = history_id
+        raw = f"{document.content_hash}|{threshold}|{source_mode}|{chunk_size}|{index_version}"
+        self.fingerprint = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def load(self):
+        """
+        Returns: {chunk_index: [(score_local, repo_file, score_internet, url), ...]}
+        """
+        checkpoints = CheckCheckpoint.objects.filter(history_id=self.history_id)
+        checkpoints.exclude(fingerprint=self.fingerprint).delete()
+
+        rows = {
+            cp.chunk_index: json.loads(cp.payload)
+            for cp in checkpoints.filter(fingerprint=self.fingerprint)
+        }
+        if not rows:
+            return {}
+
+        repo_ids = {row[1] for outcomes in rows.values() for row in outcomes if row[1]}
+        repos = {str(pk): repo for pk, repo in RepositoryFile.objects.in_bulk(list(repo_ids)).items()}
+
+        loaded = {}
+        for chunk_index, outcomes in rows.items():
+            loaded[chunk_index] = [
+                (score_local, repos.get(repo_id) if repo_id else None, score_internet, url)
+                for score_local, repo_id, score_internet, url in outcomes
+            ]
+        return loaded
+
+    def save(self, chunk_index, outcomes):
+        payload = json.dumps([
+            [score_local, str(repo.id) if repo else None, score_internet, url]
+            for score_local, repo, score_internet, url in outcomes
+        ], ensure_ascii=False)
+        CheckCheckpoint.objects.update_or_create(
+            history_id=self.history_id,
+            chunk_index=chunk_index,
+            defaults={'fingerprint': self.fingerprint, 'payload': payload},
+        )
+
+    def clear(self):
+        clear_checkpoints(self.history_id)
@@ -0,0 +1,146 @@
+"""
+Perbandingan antar dokumen dalam satu batch (mahasiswa vs mahasiswa).
+
+Setiap item batch menyimpan shingle hash-nya (``BatchFingerprint``) saat
+diproses. Setelah batch selesai, pasangan mencurigakan dihitung lewat
+inverted index shingle -> dokumen, bukan perbandingan teks O(n²):
+
+- Shingle yang muncul di terlalu banyak dokumen (soal, template tugas,
+  kutipan umum) diabaikan: df > max(2, PLAGIARISM_COLLUSION_MAX_DF * n).
+- Untuk setiap shingle tersisa, setiap pasangan dokumen yang memuatnya
+  mendapat +1 irisan (perkalian vektor shingle sparse).
+- Jaccard = irisan / gabungan; containment = irisan / shingle dokumen
+  terkecil (menangkap salinan sebagian dari dokumen yang lebih panjang).
+
+Pasangan dengan Jaccard >= PLAGIARISM_COLLUSION_MIN_JACCARD atau containment
+>= PLAGIARISM_COLLUSION_MIN_CONTAINMENT disimpan di ``PlagiarismBatch``,
+terurut dari Jaccard tertinggi.
+"""
+import sys
+from array import array
+from collections import Counter
+from itertools import combinations
+
+from django.conf import settings
+
+from apps.plagiarism.extraction import shingle_hashes
+from apps.plagiarism.models import BatchFingerprint
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def pack_shingles(hashes):
+    arr = array('Q', hashes)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def unpack_shingles(data):
+    arr = array('Q')
+    arr.frombytes(bytes(data))
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+
+def store_fingerprint(history, document):
+    """Simpan shingle dokumen item batch (dipanggil worker setelah tokenisasi)"""
+    hashes = shingle_hashes(document.text, document.sentence_spans)
+    BatchFingerprint.objects.update_or_create(
+        history_id=history.id,
+        defaults={'shingles': pack_shingles(hashes), 'shingle_count': len(hashes)},
+    )
+    return len(hashes)
+
+
+def find_suspicious_pairs(fingerprints, min_jaccard=None, min_containment=None, max_df=None):
+    """
+    fingerprints: dict key -> iterable shingle hash (tanpa duplikat)
+    Returns: list dict (a, b, jaccard, containment, shared) terurut dari
+    Jaccard tertinggi; key a/b mengikuti urutan ``fingerprints``.
+    """
+    min_jaccard = _setting('PLAGIARISM_COLLUSION_MIN_JACCARD', 0.1) if min_jaccard is None else min_jaccard
+    min_containment = (
+        _setting('PLAGIARISM_COLLUSION_MIN_CONTAINMENT', 0.5) if min_containment is None else min_containment
+    )
+    max_df = _setting('PLAGIARISM_COLLUSION_MAX_DF', 0.5) if max_df is None else max_df
+
+    keys = list(fingerprints)
+    df_cap = max(2, int(max_df * len(keys)))
+
+    # Inverted index: shingle -> index dokumen pertama (int) atau list index
+    postings = {}
+    for doc, shingles in enumerate(fingerprints.values()):
+        for shingle in shingles:
+            holders = postings.get(shingle)
+            if holders is None:
+                postings[shingle] = doc
+            elif holders.__class__ is int:
+                postings[shingle] = [holders, doc]
+            else:
+                holders.append(doc)
+
+    sizes = [0] * len(keys)
+    shared = Counter()
+    for holders in postings.values():
+        if holders.__class__ is int:
+            sizes[holders] += 1
+            continue
+        if len(holders) > df_cap:
+            continue  # boilerplate: tidak dihitung di irisan maupun gabungan
+        for doc in holders:
+            sizes[doc] += 1
+        shared.update(combinations(holders, 2))
+    del postings
+
+    pairs = []
+    for (a, b), common in shared.items():
+        union = sizes[a] + sizes[b] - common
+        smaller = min(sizes[a], sizes[b])
+        jaccard = common / union if union else 0.0
+        containment = common / smaller if smaller else 0.0
+        if jaccard >= min_jaccard or containment >= min_containment:
+            pairs.append({
+                'a': keys[a],
+                'b': keys[b],
+                'jaccard': round(jaccard * 100, 1),
+                'containment': round(containment * 100, 1),
+                'shared': common,
+            })
+
+    pairs.sort(key=lambda p: (-p['jaccard'], -p['containment'], -p['shared']))
+    return pairs
+
+
+def compute_batch_collusion(batch):
+    """
+    Hitung pasangan mencurigakan untuk item batch yang selesai, simpan ke
+    ``batch.collusion_pairs`` lalu hapus fingerprint (tidak dibutuhkan lagi).
+    Returns: list pasangan (dengan id dan nama file)
+    """
+    limit = _setting('PLAGIARISM_COLLUSION_MAX_PAIRS', 100)
+    rows = BatchFingerprint.objects.filter(
+        history__batch=batch, history__status='completed'
+    ).values_list('history_id', 'history__filename', 'shingles').order_by('history__filename')
+
+    names = {}
+    fingerprints = {}
+    for history_id, filename, data in rows:
+        key = str(history_id)
+        names[key] = filename
+        fingerprints[key] = unpack_shingles(data)
+
+    pairs = find_suspicious_pairs(fingerprints)[:limit]
+    for pair in pairs:
+        pair['a_name'] = names[pair['a']]
+        pair['b_name'] = names[pair['b']]
+
+    batch.set_collusion_pairs(pairs)
+    batch.save(update_fields=['collusion_pairs'])
+    BatchFingerprint.objects.filter(history__batch=batch).delete()
+
+    print(f"🧑‍🤝‍🧑 Collusion check: {len(fingerprints)} dokumen, {len(pairs)} pasangan mencurigakan")
+    return pairs
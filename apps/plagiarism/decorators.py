@@ -1,8 +1,13 @@
 from functools import wraps
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.urls import reverse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_protect
 
 def permission_required_custom(permission_codename):
     """
@@ -34,4 +39,29 @@ def superadmin_required(view_func):
             return view_func(request, *args, **kwargs)
         messages.error(request, "Akses ditolak. Hanya Super Admin yang diizinkan.")
         return redirect('admin:index')
-    return _wrapped_view
\ No newline at end of file
+    return _wrapped_view
+
+def async_admin_view(admin_site, view, cacheable=False):
+    """
+    Versi async ``AdminSite.admin_view`` untuk view ``async def`` (ASGI).
+    Cek izin admin (session + user dari database) dijalankan lewat
+    sync_to_async, sehingga ``request.user`` sudah termuat saat view berjalan.
+    
+    Usage (di get_urls):
+        path('check-status/', async_admin_view(self.admin_site, self.check_status))
+    """
+    @wraps(view)
+    async def _wrapped_view(request, *args, **kwargs):
+        if not await sync_to_async(admin_site.has_permission)(request):
+            return redirect_to_login(
+                request.get_full_path(),
+                reverse('admin:login', current_app=admin_site.name),
+            )
+        return await view(request, *args, **kwargs)
+    
+    if not cacheable:
+        _wrapped_view = never_cache(_wrapped_view)
+    if not getattr(view, 'csrf_exempt', False):
+        _wrapped_view = csrf_protect(_wrapped_view)
+    return _wrapped_view
+
@@ -0,0 +1,68 @@
+"""
+Representasi dokumen yang sudah diekstrak dan di-tokenize sekali.
+
+Objek ``Document`` dibawa sepanjang pipeline (ekstraksi -> pemeriksaan ->
+laporan) sehingga normalisasi dan segmentasi kalimat tidak diulang.
+Nilai turunan (daftar kalimat, hash) dihitung malas lalu disimpan.
+"""
+import hashlib
+
+from apps.plagiarism.extraction import split_sentences
+from apps.plagiarism.normalization import normalize_text
+
+
+class Document:
+    __slots__ = (
+        'text',
+        'page_starts',
+        'sentence_spans',
+        '_sentences',
+        '_content_hash',
+    )
+
+    def __init__(self, text, page_starts=(), sentence_spans=None):
+        """
+        Args:
+            text: teks kanonik (hasil normalize_text / canonical_text)
+            page_starts: offset karakter awal tiap halaman
+            sentence_spans: (awal, akhir) kalimat valid; dihitung jika None
+        """
+        self.text = text
+        self.page_starts = tuple(page_starts) or (0,)
+        self.sentence_spans = (
+            tuple(sentence_spans) if sentence_spans is not None
+            else tuple(split_sentences(text))
+        )
+        self._sentences = None
+        self._content_hash = None
+
+    @classmethod
+    def from_text(cls, raw_text):
+        """Dari teks mentah (misal hasil paste): normalisasi lalu segmentasi"""
+        return cls(normalize_text(raw_text))
+
+    @classmethod
+    def from_text_store(cls, store):
+        """Dari TextStore hasil indexing repository (tanpa segmentasi ulang)"""
+        flat = store.section('sentences')
+        return cls(store.read_all(), store.section('pages'), zip(flat[0::2], flat[1::2]))
+
+    def __len__(self):
+        return len(self.sentence_spans)
+
+    def __repr__(self):
+        return f"<Document {len(self.text)} chars, {len(self)} sentences>"
+
+    @property
+    def sentences(self):
+        if self._sentences is None:
+            text = self.text
+            self._sentences = [text[start:end] for start, end in self.sentence_spans]
+        return self._sentences
+
+    @property
+    def content_hash(self):
+        """SHA-256 hex dari teks kanonik"""
+        if self._content_hash is None:
+            self._content_hash = hashlib.sha256(self.text.encode('utf-8')).hexdigest()
+        return self._content_hash
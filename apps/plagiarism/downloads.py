@@ -0,0 +1,167 @@
+"""
+Pengiriman file laporan (PDF) ke browser.
+
+- ETag (ukuran + mtime) dan Last-Modified: download ulang dijawab 304 tanpa
+  membaca file. File laporan tidak pernah ditimpa (nama acak), jadi ETag
+  cukup dari metadata file.
+- Range / If-Range (satu rentang byte): download besar bisa dilanjutkan
+  (206 Partial Content, 416 jika rentang di luar ukuran file).
+- Offload (PLAGIARISM_DOWNLOAD_OFFLOAD): Django hanya mengirim header dan
+  web server depan yang mengirim isi file (termasuk Range), sehingga worker
+  Django tidak tertahan selama transfer.
+
+  'accel'    -> X-Accel-Redirect (nginx). Contoh konfigurasi::
+
+      location /protected-media/ {
+          internal;
+          alias /path/ke/media/;   # = MEDIA_ROOT
+      }
+
+  'sendfile' -> X-Sendfile (Apache mod_xsendfile, lighttpd), path absolut.
+"""
+import os
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+CHUNK_SIZE = 64 * 1024
+
+
+def file_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    Header ``Range`` -> (start, end) inklusif, None jika header diabaikan
+    (tidak ada / tidak valid / lebih dari satu rentang), atau 'unsatisfiable'.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, sep, end = header[6:].strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if start:
+            start = int(start)
+            end = int(end) if end else size - 1
+        else:  # suffix: N byte terakhir
+            length = int(end)
+            if length <= 0:
+                return 'unsatisfiable'
+            start, end = max(0, size - length), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return 'unsatisfiable'
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request, etag, mtime):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag  # hanya ETag kuat yang boleh dipakai
+    return parse_http_date_safe(if_range) == mtime
+
+
+def _read_file(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+async def _aread_file(path, start, length):
+    # Di ASGI: iterator sync akan ditampung seluruhnya oleh Django sebelum
+    # dikirim, jadi file dibaca per potongan di thread
+    f = await sync_to_async(open, thread_sensitive=False)(path, 'rb')
+    try:
+        await sync_to_async(f.seek, thread_sensitive=False)(start)
+        while length > 0:
+            chunk = await sync_to_async(f.read, thread_sensitive=False)(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def _offload_headers(response, path):
+    mode = getattr(settings, 'PLAGIARISM_DOWNLOAD_OFFLOAD', None)
+    if mode == 'accel':
+        prefix = getattr(settings, 'PLAGIARISM_DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(relative)
+    elif mode == 'sendfile':
+        response['X-Sendfile'] = path
+    else:
+        return False
+    return True
+
+
+def serve_file(request, path, filename, content_type='application/pdf'):
+    """
+    Response download ``path`` sebagai attachment ``filename`` dengan
+    ETag/Last-Modified, Range, dan offload ke web server jika diaktifkan.
+    """
+    stat = os.stat(path)
+    etag = file_etag(stat)
+    mtime = int(stat.st_mtime)
+
+    def finish(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(mtime)
+        # Boleh disimpan browser, tapi selalu divalidasi ulang (laporan milik user)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if not_modified is not None:
+        return finish(not_modified)
+
+    disposition = content_disposition_header(True, filename)
+
+    offloaded = HttpResponse(content_type=content_type)
+    if _offload_headers(offloaded, path):
+        # Range dan pengiriman isi ditangani web server
+        offloaded['Content-Disposition'] = disposition
+        return finish(offloaded)
+
+    size = stat.st_size
+    byte_range = None
+    if request.method == 'GET' and _if_range_matches(request, etag, mtime):
+        byte_range = parse_range(request.headers.get('Range'), size)
+
+    if byte_range == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return finish(response)
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    reader = _aread_file if isinstance(request, ASGIRequest) else _read_file
+    response = StreamingHttpResponse(
+        reader(path, start, length),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    response['Content-Length'] = str(length)
+    response['Content-Disposition'] = disposition
+    response['Accept-Ranges'] = 'bytes'
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return finish(response)
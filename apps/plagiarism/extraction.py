@@ -0,0 +1,148 @@
+"""
+Library ekstraksi + normalisasi bersama untuk pemeriksaan dan indexing repository.
+
+Kedua jalur (``PlagiarismService.extract_text`` dan indexing di
+``RepositoryFileAdmin``) memakai fungsi yang sama, sehingga dokumen yang
+byte-identik selalu menghasilkan teks kanonik, kalimat, dan shingle yang
+identik di kedua sisi.
+
+Alur:
+    pages = extract_pages(path, ext)           # teks mentah per halaman
+    text, page_starts = canonical_text(pages)  # teks kanonik + offset halaman
+    spans = split_sentences(text)              # (awal, akhir) kalimat valid
+    shingles = shingle_hashes(text, spans)     # hash word n-gram (64-bit)
+"""
+import hashlib
+import re
+
+from django.conf import settings
+
+from apps.plagiarism import segmenter
+from apps.plagiarism.extractors import extract_docx_text
+from apps.plagiarism.normalization import normalize_text
+from apps.repository.text_store import locate_spans, write_text_store
+
+SHINGLE_SIZE = 5
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def extract_pages(file_path, file_ext):
+    """Teks mentah per halaman (DOCX dianggap satu halaman)"""
+    if file_ext == '.pdf':
+        import fitz  # PyMuPDF (lazy: berat untuk di-import saat startup)
+
+        pages = []
+        doc = fitz.open(file_path)
+        try:
+            for page in doc:
+                pages.append(page.get_text("text"))
+        finally:
+            doc.close()
+        return pages
+    if file_ext == '.docx':
+        return [extract_docx_text(file_path)]
+    raise ValueError(f"Format file tidak didukung: {file_ext}")
+
+
+def canonical_text(pages):
+    """
+    Normalisasi per halaman lalu gabungkan dengan newline.
+    Returns: (text, page_starts) — page_starts = offset karakter awal tiap halaman
+    (halaman kosong tetap punya offset agar nomor halaman tidak bergeser).
+
+    Hasilnya sama dengan normalize_text('\\n'.join(pages)).
+    """
+    parts = []
+    page_starts = []
+    offset = 0
+    for page in pages:
+        cleaned = normalize_text(page)
+        if parts and cleaned:
+            offset += 1  # newline pemisah halaman
+        page_starts.append(offset)
+        if cleaned:
+            parts.append(cleaned)
+            offset += len(cleaned)
+    return '\n'.join(parts), page_starts
+
+
+def extract_canonical(file_path, file_ext):
+    """Shortcut extract_pages + canonical_text"""
+    return canonical_text(extract_pages(file_path, file_ext))
+
+
+def _punkt_spans(text):
+    """Segmentasi lama dengan NLTK punkt (butuh data dari setup_nltk.py)"""
+    from nltk.tokenize import sent_tokenize
+
+    try:
+        sentences = [s.strip() for s in sent_tokenize(text)]
+    except Exception as e:
+        print(f"Error tokenizing: {e}")
+        # Fallback: split by period
+        sentences = [
+            s.strip() + '.' for s in text.split('.')
+            if len(s.strip()) > segmenter.MIN_SENTENCE_CHARS
+        ]
+    return locate_spans(text, sentences)
+
+
+def split_sentences(text):
+    """
+    (awal, akhir) setiap kalimat valid di teks kanonik.
+    Segmenter dipilih lewat settings.PLAGIARISM_SENTENCE_SEGMENTER
+    ('regex' = rule-based Indonesia, 'punkt' = NLTK).
+    """
+    if not text or not text.strip():
+        return []
+
+    if getattr(settings, 'PLAGIARISM_SENTENCE_SEGMENTER', 'regex') == 'punkt':
+        spans = _punkt_spans(text)
+    else:
+        spans = segmenter.split_spans(text)
+
+    return [
+        (start, end) for start, end in spans
+        if segmenter.is_valid_sentence(text[start:end])
+    ]
+
+
+def _hash64(value):
+    return int.from_bytes(
+        hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little'
+    )
+
+
+def sentence_shingles(text, sentence_spans, size=SHINGLE_SIZE):
+    """
+    Hash 64-bit (stabil antar proses) dari word n-gram setiap kalimat,
+    huruf kecil, tanpa tanda baca. Kalimat yang lebih pendek dari ``size``
+    kata menjadi satu shingle. Yields: (index kalimat, set hash)
+    """
+    for index, (start, end) in enumerate(sentence_spans):
+        words = _WORD_RE.findall(text[start:end].lower())
+        if len(words) < size:
+            yield index, {_hash64(' '.join(words))} if words else set()
+            continue
+        yield index, {_hash64(' '.join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+
+def shingle_hashes(text, sentence_spans, size=SHINGLE_SIZE):
+    """Hash shingle seluruh kalimat. Returns: list terurut tanpa duplikat."""
+    hashes = set()
+    for _, sentence_hashes in sentence_shingles(text, sentence_spans, size):
+        hashes.update(sentence_hashes)
+    return sorted(hashes)
+
+
+def write_artifacts(store_path, text, page_starts):
+    """
+    Tulis teks kanonik beserta span kalimat dan awal halaman ke text store,
+    agar excerpt dan index shingle bisa memakai hasil indexing tanpa
+    segmentasi ulang.
+    Returns: sentence_spans
+    """
+    spans = split_sentences(text)
+    write_text_store(store_path, text, sentence_spans=spans, page_starts=page_starts)
+    return spans
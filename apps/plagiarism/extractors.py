@@ -0,0 +1,104 @@
+"""
+Ekstraktor teks ringan untuk dokumen yang diunggah/diindeks.
+
+DOCX dibaca langsung dari ``word/document.xml`` di dalam arsip zip dengan
+``iterparse``, tanpa membangun object model python-docx. Elemen yang sudah
+diproses langsung dibuang sehingga pemakaian memori konstan terhadap
+ukuran dokumen.
+"""
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+_BODY = f'{_W}body'
+_PARAGRAPH = f'{_W}p'
+_TEXT = f'{_W}t'
+_TAB = f'{_W}tab'
+_BREAKS = (f'{_W}br', f'{_W}cr')
+_CELL = f'{_W}tc'
+_VMERGE = f'{_W}vMerge'
+_VAL = f'{_W}val'
+
+DOCX_DOCUMENT_PART = 'word/document.xml'
+
+
+def _paragraph_text(paragraph):
+    """Gabungkan teks run di dalam satu <w:p> (termasuk hyperlink/insert)"""
+    parts = []
+    for node in paragraph.iter():
+        tag = node.tag
+        if tag == _TEXT:
+            if node.text:
+                parts.append(node.text)
+        elif tag == _TAB:
+            parts.append('\t')
+        elif tag in _BREAKS:
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def iter_docx_paragraphs(file_path):
+    """
+    Yield teks setiap paragraf DOCX sesuai urutan dokumen, termasuk
+    paragraf di dalam sel tabel.
+
+    Sel lanjutan vertical merge (``<w:vMerge/>`` tanpa ``restart``) dilewati,
+    sehingga isi sel gabungan hanya dibaca sekali (berbeda dengan
+    ``row.cells`` di python-docx yang mengulang sel gabungan).
+    Paragraf kosong tidak di-yield.
+    """
+    try:
+        archive = zipfile.ZipFile(file_path)
+    except zipfile.BadZipFile:
+        raise ValueError("File DOCX rusak atau bukan arsip DOCX yang valid")
+
+    with archive:
+        try:
+            stream = archive.open(DOCX_DOCUMENT_PART)
+        except KeyError:
+            raise ValueError("File DOCX tidak memiliki word/document.xml")
+
+        with stream:
+            body = None
+            depth = 0
+            body_depth = None
+            # Satu flag per <w:tc> yang sedang terbuka (mendukung tabel bersarang)
+            skip_cells = []
+
+            for event, elem in iterparse(stream, events=('start', 'end')):
+                tag = elem.tag
+
+                if event == 'start':
+                    depth += 1
+                    if tag == _BODY:
+                        body = elem
+                        body_depth = depth
+                    elif tag == _CELL:
+                        skip_cells.append(False)
+                    continue
+
+                depth -= 1
+
+                if tag == _VMERGE and skip_cells:
+                    # restart = sel pertama dari gabungan, selain itu lanjutan
+                    if elem.get(_VAL, 'continue') != 'restart':
+                        skip_cells[-1] = True
+                elif tag == _PARAGRAPH:
+                    if not (skip_cells and skip_cells[-1]):
+                        text = _paragraph_text(elem).strip()
+                        if text:
+                            yield text
+                    elem.clear()
+                elif tag == _CELL:
+                    skip_cells.pop()
+                    elem.clear()
+
+                # Buang blok level-atas (paragraf/tabel) yang sudah selesai
+                if body is not None and depth == body_depth:
+                    body.clear()
+
+
+def extract_docx_text(file_path):
+    """Teks DOCX lengkap (paragraf dan tabel sesuai urutan), dipisah newline"""
+    return '\n'.join(iter_docx_paragraphs(file_path))
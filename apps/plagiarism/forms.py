@@ -153,4 +153,47 @@ class PlagiarismCheckForm(forms.Form):
                 self.add_error('pasted_text', "Harap tempelkan teks yang akan diperiksa.")
             cleaned_data['document_file'] = None
         
-        return cleaned_data
\ No newline at end of file
+        return cleaned_data
+
+class BatchCheckForm(forms.Form):
+    """Form pemeriksaan batch: banyak PDF/DOCX atau file .zip berisi dokumen"""
+    ALLOWED_EXTENSIONS = ['.pdf', '.docx', '.zip']
+    
+    name = forms.CharField(
+        max_length=255,
+        label="Nama Batch",
+        help_text="Misal: Tugas Akhir Kelas A 2024",
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+    
+    batch_files = MultipleFileField(
+        label="Dokumen (PDF/DOCX atau ZIP)",
+        widget=MultipleFileInput(attrs={
+            'class': 'custom-file-input',
+            'id': 'id_batch_files',
+            'accept': '.docx,.pdf,.zip'
+        })
+    )
+    
+    source_mode = forms.ChoiceField(
+        choices=PlagiarismCheckForm.SOURCE_CHOICES,
+        label="Sumber Pengecekan",
+        initial='local',
+        widget=forms.Select(attrs={'class': 'form-control custom-select'})
+    )
+    
+    def clean_batch_files(self):
+        files = self.cleaned_data.get('batch_files')
+        if not isinstance(files, list):
+            files = [files] if files else []
+        
+        for file in files:
+            file_ext = os.path.splitext(file.name)[1].lower()
+            if file_ext not in self.ALLOWED_EXTENSIONS:
+                raise ValidationError(
+                    f'File "{file.name}": Format tidak didukung. Hanya {", ".join(self.ALLOWED_EXTENSIONS)} yang diizinkan.'
+                )
+        
+        if not files:
+            raise ValidationError("Harap upload minimal satu file.")
+        return files
@@ -0,0 +1,615 @@
+"""
+Antrian job pemeriksaan plagiarisme berbasis database.
+
+Setiap job adalah satu baris ``PlagiarismHistory``:
+    pending  -> job menunggu di antrian (file input di ``input_path``)
+    processing -> sudah di-claim oleh satu worker (``claimed_by``/``claimed_at``)
+    completed / failed / cancelled -> selesai
+
+Claim dilakukan secara atomik: ``SELECT ... FOR UPDATE SKIP LOCKED`` bila
+didukung database (MariaDB >= 10.6), lalu ``UPDATE ... WHERE status='pending'``
+sehingga satu job tidak pernah diproses dua worker sekaligus, bahkan di
+database tanpa SKIP LOCKED.
+
+Karena state antrian ada di database, job yang belum selesai tidak hilang
+saat server restart: job pending tetap menunggu, dan job processing yang
+heartbeat-nya berhenti dikembalikan ke antrian (atau digagalkan) oleh
+``reap_stale_jobs``. Reaper dijalankan saat worker start, berkala di dalam
+worker (``PeriodicReaper``), dan manual: ``python manage.py reap_stale_jobs``.
+
+Urutan claim (fair-share):
+    1. ``priority`` terkecil lebih dulu (paste text / dokumen kecil sebelum
+       dokumen besar dan batch).
+    2. Di antara prioritas yang sama, user dengan job 'processing' paling
+       sedikit didahulukan, sehingga satu user dengan ratusan job tidak
+       menahan user lain (round-robin per user).
+    3. Job tertua lebih dulu.
+
+Konsumen antrian dipilih lewat settings.PLAGIARISM_WORKER_MODE:
+    'thread'   -> WorkerPool (thread) di dalam proses web, dijalankan saat
+                  proses web start (PlagiarismConfig.ready, kecuali
+                  PLAGIARISM_WORKER_AUTOSTART = False)
+    'external' -> proses terpisah: ``python manage.py run_plagiarism_worker``
+"""
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.utils import timezone
+
+from apps.history.models import PlagiarismHistory, UserUploadQuota
+from apps.plagiarism.progress import clear_progress
+from apps.plagiarism.status import touch_status
+
+CLAIM_RETRIES = 5
+CANCEL_POLL_SECONDS = 0.5
+CANCEL_MESSAGE = "Pemeriksaan dibatalkan oleh pengguna."
+
+# Prioritas job (kecil = diproses lebih dulu)
+PRIORITY_HIGH = 0     # paste text, dokumen kecil
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9      # batch
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def job_priority(input_path, pasted=False):
+    """Prioritas default: paste text dan dokumen kecil lebih dulu"""
+    if pasted:
+        return PRIORITY_HIGH
+    small_bytes = _setting('PLAGIARISM_SMALL_DOCUMENT_BYTES', 512 * 1024)
+    try:
+        if os.path.getsize(input_path) <= small_bytes:
+            return PRIORITY_HIGH
+    except OSError:
+        pass
+    return PRIORITY_NORMAL
+
+
+def enqueue(history_id, input_path, priority=None):
+    """Masukkan job ke antrian lalu bangunkan worker pool (mode thread)"""
+    if priority is None:
+        priority = job_priority(input_path)
+    PlagiarismHistory.objects.filter(id=history_id).update(
+        status='pending',
+        input_path=input_path,
+        progress=0,
+        priority=priority,
+    )
+    user_id = PlagiarismHistory.objects.filter(id=history_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        touch_status(user_id, queue=True)
+    pool = get_pool()
+    if pool is not None:
+        pool.notify()
+
+
+def _pick_user(pending):
+    """
+    Urutan user untuk claim berikutnya: prioritas terbaik job pending-nya,
+    lalu jumlah job yang sedang diproses, lalu yang paling lama tidak
+    dilayani (round-robin), lalu job pending tertua.
+    """
+    waiting = list(
+        pending.values('user_id').annotate(best=Min('priority'), oldest=Min('check_date'))
+    )
+    if not waiting:
+        return []
+    served = {
+        row['user_id']: row
+        for row in PlagiarismHistory.objects.filter(
+            user_id__in=[w['user_id'] for w in waiting], claimed_at__isnull=False
+        ).values('user_id').annotate(
+            running=Count('id', filter=Q(status='processing')),
+            last_claim=Max('claimed_at'),
+        )
+    }
+
+    def key(w):
+        row = served.get(w['user_id'])
+        if row is None:
+            return (w['best'], 0, 0, w['oldest'].timestamp())
+        return (w['best'], row['running'], row['last_claim'].timestamp(), w['oldest'].timestamp())
+
+    waiting.sort(key=key)
+    return [w['user_id'] for w in waiting]
+
+
+def claim_next(worker_id):
+    """
+    Claim job pending berikutnya (prioritas + fair-share per user) secara atomik.
+    Returns: PlagiarismHistory yang sudah berstatus 'processing', atau None.
+    """
+    # Job tanpa input_path belum selesai di-enqueue
+    pending = PlagiarismHistory.objects.filter(status='pending', input_path__isnull=False)
+
+    for _ in range(CLAIM_RETRIES):
+        users = _pick_user(pending)
+        if not users:
+            return None
+
+        for user_id in users:
+            with transaction.atomic():
+                queryset = pending.filter(user_id=user_id).order_by('priority', 'check_date')
+                if connection.features.has_select_for_update_skip_locked:
+                    queryset = queryset.select_for_update(skip_locked=True)
+                row = queryset.values_list('id', 'check_date').first()
+                if row is None:
+                    continue  # semua job user ini sedang di-claim worker lain
+
+                job_id, check_date = row
+                now = timezone.now()
+                claimed = PlagiarismHistory.objects.filter(id=job_id, status='pending').update(
+                    status='processing',
+                    claimed_by=worker_id,
+                    claimed_at=now,
+                    heartbeat_at=now,
+                    started_at=now,
+                    progress=0,
+                    attempts=F('attempts') + 1,
+                    queue_wait_seconds=(now - check_date).total_seconds(),
+                )
+            if claimed:
+                clear_progress(job_id)
+                job = PlagiarismHistory.objects.get(id=job_id)
+                touch_status(job.user_id, queue=True)
+                return job
+            # Job diambil worker lain di antara SELECT dan UPDATE: hitung ulang
+            break
+        else:
+            return None
+    return None
+
+
+def queue_positions():
+    """
+    Perkiraan posisi semua job pending di antrian (1 = berikutnya diproses),
+    mengikuti urutan prioritas + round-robin per user pada claim_next.
+    Satu query untuk seluruh antrian. Returns: {str(job_id): posisi}
+    """
+    rows = (
+        PlagiarismHistory.objects.filter(status='pending')
+        .order_by('priority', 'check_date', 'id')
+        .values_list('id', 'user_id', 'priority', 'check_date')
+    )
+    queues = {}  # priority -> {user_id: [(check_date, job_id), ...] urut check_date}
+    for job_id, user_id, priority, check_date in rows:
+        queues.setdefault(priority, {}).setdefault(user_id, []).append((check_date, job_id))
+
+    positions = {}
+    ahead = 0  # job dengan prioritas lebih tinggi
+    for priority in sorted(queues):
+        users = queues[priority]
+        for user_id, jobs in users.items():
+            for own_rank, (check_date, job_id) in enumerate(jobs):
+                # Round-robin: tiap user lain mendapat own_rank giliran sebelum putaran ini,
+                # dan di putaran ini didahulukan jika job-nya lebih tua (user dengan job tertua dulu)
+                others = sum(
+                    min(len(other_jobs), own_rank) + (
+                        len(other_jobs) > own_rank and other_jobs[own_rank][0] < check_date
+                    )
+                    for other, other_jobs in users.items() if other != user_id
+                )
+                positions[str(job_id)] = ahead + own_rank + others + 1
+        ahead += sum(len(jobs) for jobs in users.values())
+    return positions
+
+
+def _age(value, now):
+    return f"{(now - value).total_seconds():.0f}s" if value else "-"
+
+
+def reap_stale_jobs(heartbeat_timeout=None, dry_run=False):
+    """
+    Bereskan job yang ditinggalkan worker mati / server restart.
+
+    - 'processing' dengan heartbeat lebih tua dari PLAGIARISM_HEARTBEAT_TIMEOUT
+      (atau belum pernah heartbeat dan claim lebih tua dari timeout):
+        cancel_requested          -> cancelled
+        masih ada file input dan
+        attempts < max            -> requeue (dilanjutkan dari checkpoint)
+        selain itu                -> failed (kuota dikembalikan)
+    - 'pending' tanpa file input yang lebih tua dari timeout -> failed
+
+    Job yang heartbeat-nya masih segar tidak pernah disentuh, berapa pun lama
+    pemeriksaannya: worker lama tetap berjalan, sehingga requeue akan membuat
+    dua worker memproses job yang sama.
+
+    Setiap keputusan dicetak ke log.
+    Returns: list (job_id, action, reason)
+    """
+    heartbeat_timeout = heartbeat_timeout or _setting('PLAGIARISM_HEARTBEAT_TIMEOUT', 120)
+    max_attempts = _setting('PLAGIARISM_JOB_MAX_ATTEMPTS', 3)
+    now = timezone.now()
+    beat_cutoff = now - timedelta(seconds=heartbeat_timeout)
+
+    decisions = []
+
+    def decide(job, action, reason, **fields):
+        if not dry_run:
+            if action == 'cancel':
+                if not finish_cancelled(job):
+                    return
+            else:
+                # Kondisi heartbeat_at/claimed_at: jangan sentuh job yang baru saja hidup lagi
+                updated = PlagiarismHistory.objects.filter(
+                    id=job.id, status=job.status,
+                    heartbeat_at=job.heartbeat_at, claimed_at=job.claimed_at,
+                ).update(**fields)
+                if not updated:
+                    return
+                if action == 'requeue':
+                    clear_progress(job.id)
+                    touch_status(job.user_id, queue=True)
+                if action == 'fail':
+                    from apps.plagiarism.checkpoints import clear_checkpoints
+
+                    clear_checkpoints(job.id)
+                    _remove_input(job.input_path)
+                    _job_finished(job, refund=True)
+        decisions.append((job.id, action, reason))
+        prefix = "[dry-run] " if dry_run else ""
+        print(f"🧹 {prefix}Reaper: {action} job {job.id} ({job.filename}) — {reason}")
+
+    processing = PlagiarismHistory.objects.filter(status='processing').filter(
+        Q(heartbeat_at__lt=beat_cutoff)
+        | Q(heartbeat_at__isnull=True, claimed_at__lt=beat_cutoff)
+        | Q(heartbeat_at__isnull=True, claimed_at__isnull=True, check_date__lt=beat_cutoff)
+    ).select_related('user')
+    for job in processing:
+        reason = f"heartbeat {_age(job.heartbeat_at, now)} lalu, worker {job.claimed_by or '-'}"
+
+        if job.cancel_requested:
+            decide(job, 'cancel', reason)
+        elif job.attempts < max_attempts and job.input_path and os.path.exists(job.input_path):
+            decide(
+                job, 'requeue', f"{reason}, percobaan {job.attempts}/{max_attempts}",
+                status='pending', claimed_by=None, claimed_at=None, heartbeat_at=None, progress=0,
+            )
+        else:
+            why = "file input hilang" if not (job.input_path and os.path.exists(job.input_path)) \
+                else f"batas {max_attempts} percobaan"
+            decide(
+                job, 'fail', f"{reason}, {why}",
+                status='failed',
+                input_path=None,
+                error_message="Pemeriksaan terhenti karena server restart. Silakan upload ulang dokumen.",
+                completed_at=now,
+            )
+
+    orphaned = PlagiarismHistory.objects.filter(status='pending', check_date__lt=beat_cutoff).select_related('user')
+    for job in orphaned:
+        if job.input_path and os.path.exists(job.input_path):
+            continue
+        decide(
+            job, 'fail', f"pending {_age(job.check_date, now)} tanpa file input",
+            status='failed',
+            input_path=None,
+            error_message="File dokumen tidak ditemukan di antrian. Silakan upload ulang dokumen.",
+            completed_at=now,
+        )
+
+    return decisions
+
+
+class PeriodicReaper:
+    """
+    Thread yang menjalankan reap_stale_jobs setiap PLAGIARISM_REAPER_INTERVAL
+    detik di dalam proses worker.
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval or _setting('PLAGIARISM_REAPER_INTERVAL', 60)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="plagiarism-reaper", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                reap_stale_jobs()
+            except Exception as e:
+                print(f"⚠️  Reaper error: {e}")
+            finally:
+                close_old_connections()
+
+
+class CheckCancelled(Exception):
+    """Dilempar di tengah pemeriksaan jika user membatalkan job"""
+
+
+class CancelToken:
+    """
+    Flag pembatalan yang dibaca dari database (``cancel_requested``) paling
+    sering setiap CANCEL_POLL_SECONDS. Aman dipanggil dari banyak thread
+    pemeriksa sekaligus; cukup satu query per interval untuk semuanya.
+
+    worker_id: jika diisi, job juga dianggap berhenti begitu tidak lagi
+    di-claim worker ini (mis. sudah di-requeue reaper dan diambil worker lain).
+    """
+
+    def __init__(self, job_id, poll_seconds=CANCEL_POLL_SECONDS, worker_id=None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.poll_seconds = poll_seconds
+        self._cancelled = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_cancelled(self, force=False):
+        if self._cancelled:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            if force or now - self._checked_at >= self.poll_seconds:
+                self._checked_at = now
+                row = PlagiarismHistory.objects.filter(id=self.job_id).values_list(
+                    'cancel_requested', 'claimed_by'
+                ).first()
+                self._cancelled = row is None or row[0] or (
+                    self.worker_id is not None and row[1] != self.worker_id
+                )
+        return self._cancelled
+
+    def check(self, force=False):
+        if self.is_cancelled(force):
+            raise CheckCancelled(CANCEL_MESSAGE)
+
+
+def _remove_input(path):
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"⚠️  Gagal menghapus file input {path}: {e}")
+
+
+def _job_finished(job, refund=False):
+    """
+    Efek samping setelah job berhenti di luar alur normal worker: kembalikan
+    kuota (bukan untuk item batch, yang memang tidak memakai kuota),
+    selesaikan batch jika ini item terakhir, lalu perbarui snapshot status.
+    """
+    if job.batch_id is None:
+        if refund:
+            UserUploadQuota.refund_quota(job.user, job.check_date.date())
+    else:
+        from apps.plagiarism.batch import finalize_batch
+
+        finalize_batch(job.batch_id)
+    touch_status(job.user, queue=True)
+
+
+def finish_cancelled(job, worker_id=None):
+    """
+    Tandai job 'processing' yang dibatalkan sebagai 'cancelled', hapus file
+    input, dan kembalikan kuota. Returns True jika status berubah.
+    worker_id: jika diisi, hanya berlaku selama job masih di-claim worker ini.
+    """
+    rows = PlagiarismHistory.objects.filter(id=job.id, status='processing')
+    if worker_id is not None:
+        rows = rows.filter(claimed_by=worker_id)
+    updated = rows.update(
+        status='cancelled',
+        error_message=CANCEL_MESSAGE,
+        input_path=None,
+        completed_at=timezone.now(),
+    )
+    if updated:
+        from apps.plagiarism.checkpoints import clear_checkpoints
+
+        clear_checkpoints(job.id)
+        _remove_input(job.input_path)
+        _job_finished(job, refund=True)
+        print(f"🛑 Job {job.id} cancelled")
+    return bool(updated)
+
+
+def request_cancel(job):
+    """
+    Batalkan job milik user (dipanggil dari admin).
+    - pending    -> langsung 'cancelled' + kuota dikembalikan
+    - processing -> set cancel_requested; worker berhenti di kalimat berikutnya
+    Returns: status hasil ('cancelled', 'cancelling') atau None jika job sudah selesai.
+    """
+    now = timezone.now()
+    if PlagiarismHistory.objects.filter(id=job.id, status='pending').update(
+        status='cancelled', cancel_requested=True, error_message=CANCEL_MESSAGE,
+        input_path=None, completed_at=now,
+    ):
+        _remove_input(job.input_path)
+        _job_finished(job, refund=True)
+        return 'cancelled'
+
+    if PlagiarismHistory.objects.filter(id=job.id, status='processing').update(cancel_requested=True):
+        touch_status(job.user_id)
+        return 'cancelling'
+    return None
+
+
+class JobHeartbeat:
+    """
+    Context manager yang memperbarui ``heartbeat_at`` job secara berkala
+    dari thread terpisah selama job diproses (dan masih di-claim worker ini).
+    """
+
+    def __init__(self, job_id, worker_id, interval=None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval or _setting('PLAGIARISM_HEARTBEAT_SECONDS', 15)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._beat, name=f"heartbeat-{self.job_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _beat(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    PlagiarismHistory.objects.filter(
+                        id=self.job_id, status='processing', claimed_by=self.worker_id
+                    ).update(heartbeat_at=timezone.now())
+                except Exception as e:
+                    # Error DB sesaat: buang koneksi, coba lagi di interval berikutnya
+                    print(f"⚠️  Heartbeat error for job {self.job_id}: {e}")
+                    connection.close()
+        finally:
+            connection.close()
+
+
+def run_job(job):
+    """Proses satu job yang sudah di-claim (dengan heartbeat)"""
+    from apps.plagiarism.tasks import PlagiarismTask
+
+    with JobHeartbeat(job.id, job.claimed_by):
+        PlagiarismTask._process_worker(job.id, job.input_path, job.source_mode, worker_id=job.claimed_by)
+
+
+def run_worker(worker_id, stop_event, wakeup_event=None, poll_interval=None):
+    """
+    Loop worker: claim -> proses -> ulangi, sampai ``stop_event`` di-set.
+    Job yang sedang berjalan selalu diselesaikan dulu (graceful shutdown).
+
+    Args:
+        stop_event: threading.Event / multiprocessing.Event
+        wakeup_event: Event opsional untuk membangunkan worker saat ada job baru
+    """
+    poll_interval = poll_interval or _setting('PLAGIARISM_QUEUE_POLL_SECONDS', 5)
+
+    while not stop_event.is_set():
+        job = None
+        try:
+            job = claim_next(worker_id)
+            if job is not None:
+                print(f"📥 {worker_id} claimed job {job.id}")
+                run_job(job)
+        except Exception as e:
+            print(f"❌ Worker {worker_id} error: {e}")
+        finally:
+            # Setiap thread punya koneksi DB sendiri; jangan biarkan menggantung
+            close_old_connections()
+
+        if job is None:
+            if wakeup_event is not None:
+                wakeup_event.wait(poll_interval)
+                wakeup_event.clear()
+            else:
+                stop_event.wait(poll_interval)
+
+
+class WorkerPool:
+    """
+    Pool worker thread berukuran tetap yang mengonsumsi antrian database
+    di dalam proses web (PLAGIARISM_WORKER_MODE = 'thread').
+    Ukuran diatur lewat settings.PLAGIARISM_WORKER_CONCURRENCY.
+    """
+
+    def __init__(self, size, poll_interval):
+        self.size = size
+        self.poll_interval = poll_interval
+        self.pid = os.getpid()
+        self.worker_prefix = f"{socket.gethostname()}:{self.pid}"
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._reaper = None
+
+    @property
+    def running(self):
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        try:
+            reap_stale_jobs()
+        finally:
+            close_old_connections()
+        self._reaper = PeriodicReaper().start()
+
+        for idx in range(self.size):
+            thread = threading.Thread(
+                target=run_worker,
+                args=(f"{self.worker_prefix}:{idx}", self._stop, self._wakeup, self.poll_interval),
+                name=f"plagiarism-worker-{idx}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        print(f"🧵 Plagiarism worker pool started: {self.size} worker(s)")
+
+    def notify(self):
+        """Bangunkan worker yang sedang menunggu (ada job baru)"""
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wakeup.set()
+        if self._reaper is not None:
+            self._reaper.stop()
+        for thread in self._threads:
+            thread.join(timeout)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Worker pool proses ini (dibuat dan dijalankan saat pertama dipakai).
+    Returns None jika PLAGIARISM_WORKER_MODE = 'external'.
+    """
+    global _pool
+    if _setting('PLAGIARISM_WORKER_MODE', 'thread') != 'thread':
+        return None
+    if _pool is not None and _pool.pid != os.getpid():
+        # Proses hasil fork (misal gunicorn --preload): thread pool induk tidak ikut
+        _pool = None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = WorkerPool(
+                    size=_setting('PLAGIARISM_WORKER_CONCURRENCY', 2),
+                    poll_interval=_setting('PLAGIARISM_QUEUE_POLL_SECONDS', 5),
+                )
+                pool.start()
+                _pool = pool
+    return _pool
+
+
+def start_pool_in_background():
+    """
+    Jalankan get_pool() di thread terpisah (dipanggil dari AppConfig.ready(),
+    yang tidak boleh melakukan query database; pool start menjalankan reaper).
+    """
+    def start():
+        try:
+            get_pool()
+        except Exception as e:
+            print(f"❌ Gagal menjalankan worker pool: {e}")
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=start, name='plagiarism-pool-start', daemon=True).start()
@@ -2,13 +2,24 @@ import os
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
+from django.db.models import Exists, OuterRef
 from apps.history.models import PlagiarismHistory
-from apps.plagiarism.models import PlagiarismSettings
+from apps.plagiarism.models import PlagiarismSettings, ReportData
+from apps.plagiarism import result_cache, uploads
+from apps.plagiarism.status import touch_status
 
 class Command(BaseCommand):
     help = 'Hapus file laporan plagiarisme lama (record tetap ada)'
 
     def handle(self, *args, **options):
+        pruned = result_cache.prune()
+        if pruned:
+            self.stdout.write(f'Pruned {pruned} expired cached results')
+        
+        pruned = uploads.prune_cas()
+        if pruned:
+            self.stdout.write(f'Pruned {pruned} unreferenced upload blobs')
+        
         auto_delete_days = PlagiarismSettings.get_auto_delete_days()
         
         if auto_delete_days <= 0:
@@ -22,6 +33,8 @@ class Command(BaseCommand):
             completed_at__lt=cutoff_date,
             status='completed',
             file_deleted=False  # Hanya yang belum dihapus
+        ).annotate(
+            has_data=Exists(ReportData.objects.filter(history=OuterRef('pk')))
         )
         
         count = 0
@@ -30,14 +43,22 @@ class Command(BaseCommand):
             if report.report_file and os.path.exists(report.report_file.path):
                 try:
                     file_path = report.report_file.path
+                    if report.has_data and os.path.getmtime(file_path) > cutoff_date.timestamp():
+                        continue  # baru dirender ulang (diunduh lagi)
                     os.remove(file_path)
                     self.stdout.write(f'Deleted file: {file_path}')
                     
+                    if report.has_data:
+                        # Laporan dirender ulang dari ReportData saat diunduh lagi
+                        count += 1
+                        continue
+                    
                     # Update record: tandai file sudah dihapus
                     report.file_deleted = True
                     report.file_deleted_at = timezone.now()
                     report.file_deleted_reason = f'Auto-cleanup after {auto_delete_days} days'
                     report.save()
+                    touch_status(report.user_id)
                     
                     count += 1
                     self.stdout.write(f'✓ Marked as deleted: {report.filename}')
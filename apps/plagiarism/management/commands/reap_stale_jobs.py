@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from apps.plagiarism.job_queue import reap_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Requeue / gagalkan job pemeriksaan yang heartbeat-nya sudah kedaluwarsa'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--timeout', type=int, default=None,
+            help='Batas umur heartbeat dalam detik (default: PLAGIARISM_HEARTBEAT_TIMEOUT)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Tampilkan keputusan tanpa mengubah data'
+        )
+
+    def handle(self, *args, **options):
+        decisions = reap_stale_jobs(
+            heartbeat_timeout=options['timeout'],
+            dry_run=options['dry_run'],
+        )
+
+        if not decisions:
+            self.stdout.write(self.style.SUCCESS('✓ Tidak ada job yang macet'))
+            return
+
+        counts = {}
+        for _, action, _ in decisions:
+            counts[action] = counts.get(action, 0) + 1
+        summary = ', '.join(f'{n} {action}' for action, n in sorted(counts.items()))
+        self.stdout.write(self.style.SUCCESS(f'✓ Reaper selesai: {summary}'))
@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_process(worker_id, stop_event, poll_interval):
+    """Entry point proses worker (spawn: Django di-setup ulang di proses anak)"""
+    import django
+    django.setup()
+
+    from apps.plagiarism.job_queue import run_worker
+
+    # Ctrl+C/SIGTERM bisa dikirim ke seluruh process group; parent yang mengatur
+    # shutdown lewat stop_event sehingga job yang sedang berjalan tetap selesai
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    print(f"👷 Worker {worker_id} started (pid {os.getpid()})")
+    run_worker(worker_id, stop_event, poll_interval=poll_interval)
+    print(f"👋 Worker {worker_id} stopped")
+
+
+class Command(BaseCommand):
+    help = 'Jalankan worker pemeriksaan plagiarisme (proses terpisah dari web server)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=None,
+            help='Jumlah proses worker (default: PLAGIARISM_WORKER_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--poll', type=float, default=None,
+            help='Interval cek antrian saat idle dalam detik (default: PLAGIARISM_QUEUE_POLL_SECONDS)'
+        )
+        parser.add_argument(
+            '--heartbeat', type=float, default=30,
+            help='Interval log heartbeat supervisor dalam detik'
+        )
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+        from apps.plagiarism.job_queue import PeriodicReaper, reap_stale_jobs
+
+        concurrency = options['concurrency'] or getattr(settings, 'PLAGIARISM_WORKER_CONCURRENCY', 2)
+        poll_interval = options['poll'] or getattr(settings, 'PLAGIARISM_QUEUE_POLL_SECONDS', 5)
+        heartbeat = options['heartbeat']
+
+        if getattr(settings, 'PLAGIARISM_WORKER_MODE', 'thread') == 'thread':
+            self.stdout.write(self.style.WARNING(
+                "PLAGIARISM_WORKER_MODE = 'thread': proses web juga menjalankan worker. "
+                "Set ke 'external' agar pemeriksaan hanya dilakukan oleh command ini."
+            ))
+
+        reap_stale_jobs()
+        # Jangan wariskan koneksi DB ke proses anak
+        connections.close_all()
+
+        ctx = multiprocessing.get_context('spawn')
+        stop_event = ctx.Event()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        workers = {}
+
+        def spawn(idx):
+            worker_id = f"{prefix}:p{idx}"
+            process = ctx.Process(
+                target=_worker_process,
+                args=(worker_id, stop_event, poll_interval),
+                name=f"plagiarism-worker-{idx}",
+            )
+            process.start()
+            workers[idx] = process
+
+        # Signal handler hanya mencatat permintaan; Event multiprocessing tidak aman
+        # di-set dari dalam handler (bisa deadlock dengan wait() di loop utama)
+        shutdown_requests = []
+
+        def request_shutdown(signum, frame):
+            shutdown_requests.append(signum)
+
+        signal.signal(signal.SIGINT, request_shutdown)
+        signal.signal(signal.SIGTERM, request_shutdown)
+
+        for idx in range(concurrency):
+            spawn(idx)
+        # Reaper berkala berjalan di proses supervisor (thread), bukan di tiap worker
+        reaper = PeriodicReaper().start()
+        self.stdout.write(self.style.SUCCESS(f'✓ {concurrency} worker berjalan (poll {poll_interval}s)'))
+
+        last_beat = time.monotonic()
+        while not shutdown_requests:
+            time.sleep(1)
+
+            # Supervisor: jalankan ulang worker yang mati tak terduga
+            for idx, process in list(workers.items()):
+                if not process.is_alive() and not shutdown_requests:
+                    self.stdout.write(self.style.ERROR(
+                        f'Worker {idx} berhenti (exit code {process.exitcode}), menjalankan ulang'
+                    ))
+                    spawn(idx)
+
+            if heartbeat and time.monotonic() - last_beat >= heartbeat:
+                alive = sum(1 for p in workers.values() if p.is_alive())
+                self.stdout.write(f'💓 {time.strftime("%H:%M:%S")} {alive}/{concurrency} worker aktif')
+                last_beat = time.monotonic()
+
+        self.stdout.write(self.style.WARNING(
+            'Shutdown: menunggu job yang sedang berjalan selesai (kirim sinyal lagi untuk paksa)...'
+        ))
+        stop_event.set()
+
+        handled = len(shutdown_requests)
+        while any(p.is_alive() for p in workers.values()):
+            time.sleep(0.5)
+            if len(shutdown_requests) > handled:
+                self.stdout.write(self.style.ERROR('Shutdown paksa: menghentikan semua worker'))
+                for process in workers.values():
+                    process.kill()
+                handled = len(shutdown_requests)
+
+        for process in workers.values():
+            process.join()
+        reaper.stop()
+        self.stdout.write(self.style.SUCCESS('✓ Semua worker berhenti'))
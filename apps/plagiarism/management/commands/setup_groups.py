@@ -13,6 +13,7 @@ class Command(BaseCommand):
                 'can_check_plagiarism',
                 'can_check_plagiarism_paste',
                 'can_download_report',
+                'can_batch_check',
                 'can_view_repository',
                 'can_add_repository',
                 'can_edit_repository',
@@ -28,6 +29,7 @@ class Command(BaseCommand):
                 'can_check_plagiarism',
                 'can_check_plagiarism_paste',
                 'can_download_report',
+                'can_batch_check',
                 'can_view_repository',
                 'can_add_repository',
                 'can_edit_repository',
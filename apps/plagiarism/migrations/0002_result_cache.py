@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plagiarism', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckResultCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('content_hash', models.CharField(db_index=True, max_length=64)),
+                ('threshold', models.IntegerField()),
+                ('source_mode', models.CharField(max_length=20)),
+                ('index_version', models.CharField(max_length=100)),
+                ('check_results', models.TextField(help_text='Hasil process_check (JSON string)')),
+                ('sentence_count', models.IntegerField(default=0)),
+                ('report_file', models.CharField(blank=True, max_length=500, null=True)),
+                ('report_filename', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True)),
+                ('hit_count', models.IntegerField(default=0)),
+                ('report_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Cache Hasil Pemeriksaan',
+                'verbose_name_plural': 'Cache Hasil Pemeriksaan',
+                'db_table': 'plagiarism_result_cache',
+            },
+        ),
+    ]
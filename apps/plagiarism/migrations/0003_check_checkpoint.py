@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0004_job_priority'),
+        ('plagiarism', '0002_result_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chunk_index', models.IntegerField()),
+                ('fingerprint', models.CharField(help_text='Hash dokumen + parameter pemeriksaan', max_length=64)),
+                ('payload', models.TextField(help_text='Hasil per kalimat (JSON string)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('history', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='history.plagiarismhistory')),
+            ],
+            options={
+                'verbose_name': 'Checkpoint Pemeriksaan',
+                'verbose_name_plural': 'Checkpoint Pemeriksaan',
+                'db_table': 'plagiarism_checkpoint',
+                'unique_together': {('history', 'chunk_index')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0007_batch_collusion'),
+        ('plagiarism', '0003_check_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shingles', models.BinaryField()),
+                ('shingle_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('history', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fingerprint', to='history.plagiarismhistory')),
+            ],
+            options={
+                'verbose_name': 'Fingerprint Batch',
+                'verbose_name_plural': 'Fingerprint Batch',
+                'db_table': 'plagiarism_batch_fingerprint',
+            },
+        ),
+    ]
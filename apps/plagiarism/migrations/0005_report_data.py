@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0007_batch_collusion'),
+        ('plagiarism', '0004_batch_collusion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.TextField(help_text='check_results + metadata laporan (JSON string)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('rendered_at', models.DateTimeField(blank=True, null=True)),
+                ('history', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='report_data', to='history.plagiarismhistory')),
+            ],
+            options={
+                'verbose_name': 'Data Laporan',
+                'verbose_name_plural': 'Data Laporan',
+                'db_table': 'plagiarism_report_data',
+            },
+        ),
+    ]
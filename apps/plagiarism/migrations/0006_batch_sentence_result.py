@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0007_batch_collusion'),
+        ('plagiarism', '0005_report_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchSentenceResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Mode sumber + threshold + hash kalimat', max_length=64)),
+                ('payload', models.TextField(help_text='(score_local, repo_id, score_internet, url) (JSON string)')),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sentence_results', to='history.plagiarismbatch')),
+            ],
+            options={
+                'verbose_name': 'Hasil Kalimat Batch',
+                'verbose_name_plural': 'Hasil Kalimat Batch',
+                'db_table': 'plagiarism_batch_sentence',
+                'unique_together': {('batch', 'key')},
+            },
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 
 class PlagiarismSettings(models.Model):
@@ -40,4 +41,119 @@ class PlagiarismSettings(models.Model):
         super().save(*args, **kwargs)
     
     def delete(self, *args, **kwargs):
-        pass
\ No newline at end of file
+        pass
+
+class CheckResultCache(models.Model):
+    """
+    Hasil pemeriksaan yang bisa dipakai ulang untuk dokumen identik.
+    Key = hash dari (content hash, threshold, mode sumber, versi index
+    repository, segmenter) — lihat apps.plagiarism.result_cache.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    content_hash = models.CharField(max_length=64, db_index=True)
+    threshold = models.IntegerField()
+    source_mode = models.CharField(max_length=20)
+    index_version = models.CharField(max_length=100)
+
+    check_results = models.TextField(help_text="Hasil process_check (JSON string)")
+    sentence_count = models.IntegerField(default=0)
+
+    # Laporan PDF asal (dipakai ulang jika masih ada)
+    report_file = models.CharField(max_length=500, null=True, blank=True)
+    report_filename = models.CharField(max_length=255, blank=True)
+    report_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='+'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+    hit_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'plagiarism_result_cache'
+        verbose_name = 'Cache Hasil Pemeriksaan'
+        verbose_name_plural = 'Cache Hasil Pemeriksaan'
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.source_mode}, {self.threshold}%)"
+
+
+class CheckCheckpoint(models.Model):
+    """
+    Hasil sementara satu potongan kalimat dari process_check, agar job yang
+    terhenti (worker mati / server restart) bisa dilanjutkan.
+    Lihat apps.plagiarism.checkpoints.
+    """
+    history = models.ForeignKey('history.PlagiarismHistory', on_delete=models.CASCADE, related_name='checkpoints')
+    chunk_index = models.IntegerField()
+    fingerprint = models.CharField(max_length=64, help_text="Hash dokumen + parameter pemeriksaan")
+    payload = models.TextField(help_text="Hasil per kalimat (JSON string)")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'plagiarism_checkpoint'
+        unique_together = ('history', 'chunk_index')
+        verbose_name = 'Checkpoint Pemeriksaan'
+        verbose_name_plural = 'Checkpoint Pemeriksaan'
+
+    def __str__(self):
+        return f"{self.history_id} #{self.chunk_index}"
+
+
+class BatchFingerprint(models.Model):
+    """
+    Shingle hash (uint64 little-endian) satu item batch untuk perbandingan
+    antar dokumen dalam batch. Lihat apps.plagiarism.collusion.
+    """
+    history = models.OneToOneField('history.PlagiarismHistory', on_delete=models.CASCADE, related_name='fingerprint')
+    shingles = models.BinaryField()
+    shingle_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'plagiarism_batch_fingerprint'
+        verbose_name = 'Fingerprint Batch'
+        verbose_name_plural = 'Fingerprint Batch'
+
+    def __str__(self):
+        return f"{self.history_id} ({self.shingle_count} shingle)"
+
+
+class BatchSentenceResult(models.Model):
+    """
+    Hasil pemeriksaan satu kalimat yang dibagi antar dokumen dalam satu
+    batch (lintas worker). Dihapus saat batch selesai.
+    Lihat apps.plagiarism.batch.BatchSentenceCache.
+    """
+    batch = models.ForeignKey('history.PlagiarismBatch', on_delete=models.CASCADE, related_name='sentence_results')
+    key = models.CharField(max_length=64, help_text="Mode sumber + threshold + hash kalimat")
+    payload = models.TextField(help_text="(score_local, repo_id, score_internet, url) (JSON string)")
+
+    class Meta:
+        db_table = 'plagiarism_batch_sentence'
+        unique_together = ('batch', 'key')
+        verbose_name = 'Hasil Kalimat Batch'
+        verbose_name_plural = 'Hasil Kalimat Batch'
+
+    def __str__(self):
+        return f"{self.batch_id} {self.key}"
+
+
+class ReportData(models.Model):
+    """
+    Hasil pemeriksaan terstruktur satu history (JSON string) sebagai sumber
+    laporan PDF. PDF dirender saat pertama diunduh dan dirender ulang jika
+    filenya sudah dibersihkan. Lihat apps.plagiarism.reporting.
+    """
+    history = models.OneToOneField('history.PlagiarismHistory', on_delete=models.CASCADE, related_name='report_data')
+    payload = models.TextField(help_text="check_results + metadata laporan (JSON string)")
+    created_at = models.DateTimeField(auto_now_add=True)
+    rendered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'plagiarism_report_data'
+        verbose_name = 'Data Laporan'
+        verbose_name_plural = 'Data Laporan'
+
+    def __str__(self):
+        return str(self.history_id)
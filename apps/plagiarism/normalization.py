@@ -0,0 +1,63 @@
+"""
+Normalisasi teks dokumen berbasis tabel translate dan regex terkompilasi.
+
+Semua tabel dan pola dibangun sekali saat modul di-import, sehingga
+normalisasi satu dokumen hanya berupa beberapa operasi level-C
+(encode + translate + dua kali ``re.sub``) tanpa loop per karakter di Python.
+
+Translate dilakukan pada bytes UTF-8: byte kontrol (< 0x20) dan byte ASCII
+tidak pernah muncul di dalam urutan multibyte UTF-8, sehingga aman dihapus/
+diganti langsung, dan ``bytes.translate`` jauh lebih cepat daripada
+``str.translate`` untuk teks yang mengandung karakter non-ASCII.
+
+Modul ini sengaja tidak bergantung pada Django agar bisa dipakai
+oleh benchmark dan worker tanpa setup settings.
+"""
+import re
+
+# Karakter ASCII yang dipertahankan oleh mode ``strip_symbols``
+# (sama dengan whitelist lama di ``PlagiarismService._clean_text``)
+_ALLOWED_ASCII = frozenset(
+    b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    b' .,!?;:\n\r\t()-"\'/'
+)
+
+# Control character yang dihapus (semua < 0x20 kecuali newline dan tab)
+_CONTROL_DELETE = bytes(b for b in range(32) if b not in b'\n\t')
+
+# ASCII di luar whitelist -> spasi, byte non-ASCII (>= 0x80) tidak diubah
+_SYMBOL_TABLE = bytes(
+    b if (b in _ALLOWED_ASCII or b > 127) else ord(' ')
+    for b in range(256)
+)
+
+# Tab atau spasi beruntun -> satu spasi (spasi tunggal tidak disentuh)
+_HSPACE_RE = re.compile(r'\t[ \t]*| [ \t]+')
+# Whitespace di sekitar newline (termasuk baris kosong) -> satu newline.
+# Setara dengan strip per baris + buang baris kosong.
+_LINE_EDGE_RE = re.compile(r'\s*\n\s*')
+
+
+def normalize_text(text, strip_symbols=False):
+    """
+    Normalisasi teks satu dokumen:
+    - Hapus control character (kecuali newline/tab) dan lone surrogate
+    - Opsional: ganti simbol ASCII non-whitelist dengan spasi
+    - Rapikan whitespace, strip setiap baris, buang baris kosong
+
+    Hasilnya idempotent: normalize_text(normalize_text(t)) == normalize_text(t).
+    """
+    if not text:
+        return ""
+
+    # encode 'ignore' sekaligus membuang lone surrogate (tidak valid di utf8mb4)
+    data = text.encode('utf-8', 'ignore')
+    if strip_symbols:
+        data = data.translate(_SYMBOL_TABLE)
+    else:
+        data = data.translate(None, _CONTROL_DELETE)
+    text = data.decode('utf-8')
+
+    text = _HSPACE_RE.sub(' ', text)
+    text = _LINE_EDGE_RE.sub('\n', text)
+    return text.strip()
@@ -0,0 +1,94 @@
+"""
+Pelaporan progress job pemeriksaan yang di-throttle.
+
+``ProgressReporter`` dipanggil setiap potongan kalimat selesai, tetapi hanya
+menulis jika progress naik minimal PLAGIARISM_PROGRESS_MIN_DELTA persen DAN
+sudah lewat PLAGIARISM_PROGRESS_INTERVAL detik sejak tulisan terakhir.
+Penulisan memakai UPDATE satu kolom (``progress``), bukan save() seluruh baris.
+
+Backend dipilih lewat settings.PLAGIARISM_PROGRESS_BACKEND:
+    'db'    -> kolom ``PlagiarismHistory.progress``
+    'cache' -> database hanya ditulis pada tahap utama (force=True)
+
+Di kedua backend progress juga ditulis ke cache bersama
+(settings.CACHES['plagiarism']), yang dibaca snapshot status
+(apps.plagiarism.status) tanpa query database.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.history.models import PlagiarismHistory
+
+CACHE_ALIAS = 'plagiarism'
+CACHE_TIMEOUT = 6 * 60 * 60
+
+
+def _backend():
+    return getattr(settings, 'PLAGIARISM_PROGRESS_BACKEND', 'db')
+
+
+def progress_cache_key(history_id):
+    return f"plagiarism:progress:{history_id}"
+
+
+def clear_progress(history_id):
+    """
+    Hapus progress cache job. Dipanggil saat job di-claim / dikembalikan ke
+    antrian, agar progress percobaan sebelumnya tidak ikut tampil.
+    """
+    caches[CACHE_ALIAS].delete(progress_cache_key(history_id))
+
+
+class ProgressReporter:
+
+    def __init__(self, history_id, min_interval=None, min_delta=None):
+        self.history_id = history_id
+        self.min_interval = (
+            getattr(settings, 'PLAGIARISM_PROGRESS_INTERVAL', 1.0)
+            if min_interval is None else min_interval
+        )
+        self.min_delta = (
+            getattr(settings, 'PLAGIARISM_PROGRESS_MIN_DELTA', 2)
+            if min_delta is None else min_delta
+        )
+        self.backend = _backend()
+        self.written = None
+        self._written_at = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, percent, force=False):
+        """
+        Laporkan progress (0-100). force=True selalu menulis (tahap utama),
+        termasuk ke database pada backend 'cache'.
+        Returns True jika nilai ditulis.
+        """
+        percent = int(max(0, min(100, percent)))
+        with self._lock:
+            now = time.monotonic()
+            if not force:
+                if self.written is not None and (
+                    percent - self.written < self.min_delta
+                    or now - self._written_at < self.min_interval
+                ):
+                    return False
+
+            caches[CACHE_ALIAS].set(progress_cache_key(self.history_id), percent, CACHE_TIMEOUT)
+            if self.backend != 'cache' or force:
+                PlagiarismHistory.objects.filter(id=self.history_id).update(progress=percent)
+
+            self.written = percent
+            self._written_at = now
+            return True
+
+    def stage(self, start, end):
+        """
+        Callback (done, total) untuk process_check yang memetakan kemajuan
+        kalimat ke rentang progress [start, end].
+        """
+        def report(done, total):
+            if total:
+                self.set(start + (end - start) * done / total)
+        return report
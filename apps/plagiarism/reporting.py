@@ -0,0 +1,189 @@
+"""
+Laporan PDF dirender saat dibutuhkan (lazy).
+
+Worker hanya menyimpan hasil pemeriksaan terstruktur (``ReportData``) dan
+nama file laporan (``history.report_file``); banyak laporan tidak pernah
+diunduh, jadi rendering tidak lagi menambah waktu penyelesaian job.
+
+- Download pertama merender PDF ke ``history.report_file`` (file sementara
+  lalu ``os.replace``, sehingga dua download bersamaan tidak menghasilkan
+  file setengah jadi). Download berikutnya memakai file di disk.
+- ``cleanup_old_reports`` cukup menghapus file PDF; download berikutnya
+  merender ulang dari data yang sama. Tanggal pemeriksaan, threshold, dan
+  jumlah kalimat diambil dari data, bukan dari saat render.
+- Rendering (ReportLab, CPU-bound) berjalan di process pool terpisah
+  (PLAGIARISM_REPORT_WORKERS proses, 0 = di thread pemanggil), sehingga
+  tidak berebut GIL dengan web/worker pemeriksaan. Ini soal isolasi dan
+  responsivitas, bukan kecepatan: satu laporan tidak dirender lebih cepat,
+  dan pada server 1 CPU total waktu render tidak turun. Proses pool memakai
+  style yang dibangun sekali per proses (``pdf_report``). Laporan ringkasan
+  batch (``render_batch_summary``) dirender lewat pool yang sama.
+"""
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from apps.plagiarism.models import ReportData
+
+# Naikkan jika isi payload berubah
+REPORT_FORMAT = 1
+
+class ReportRenderError(Exception):
+    """Data laporan ada tetapi PDF gagal dirender (error / timeout)"""
+
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_render_pool():
+    """
+    Process pool render laporan (dibuat saat pertama dipakai).
+    Returns None jika PLAGIARISM_REPORT_WORKERS = 0.
+    """
+    global _render_pool
+    workers = _setting('PLAGIARISM_REPORT_WORKERS', 2)
+    if workers <= 0:
+        return None
+    if _render_pool is None:
+        with _render_pool_lock:
+            if _render_pool is None:
+                # spawn: fork dari proses ber-thread (web / worker pool) tidak aman
+                _render_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+                )
+    return _render_pool
+
+
+def _reset_render_pool(pool):
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is pool:
+            _render_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render(build, output_path, *args, **kwargs):
+    """
+    Jalankan ``build`` (fungsi pdf_report) di process pool (fallback: proses
+    ini jika pool dinonaktifkan atau rusak). Returns: output_path, atau None
+    jika gagal.
+    """
+    pool = get_render_pool()
+    try:
+        if pool is not None:
+            try:
+                timeout = _setting('PLAGIARISM_REPORT_RENDER_TIMEOUT', 300)
+                return pool.submit(build, output_path, *args, **kwargs).result(timeout=timeout)
+            except BrokenProcessPool:
+                print("⚠️  Render pool rusak, render di proses ini")
+                _reset_render_pool(pool)
+        return build(output_path, *args, **kwargs)
+    except FutureTimeout:
+        print(f"✗ PDF render timeout: {output_path}")
+        return None
+    except Exception as e:
+        print(f"✗ Error generating PDF: {e}")
+        return None
+
+
+def render_pdf(output_path, filename, check_results, threshold, sentence_count=None, checked_at=None):
+    """Render laporan pemeriksaan satu dokumen. Returns: output_path atau None"""
+    from apps.plagiarism import pdf_report
+
+    return _render(
+        pdf_report.build_report, output_path, filename, check_results, threshold,
+        sentence_count=sentence_count, checked_at=checked_at,
+    )
+
+
+def render_batch_summary(output_path, summary):
+    """Render ringkasan batch (hasil batch.summarize_batch). Returns: output_path atau None"""
+    from apps.plagiarism import pdf_report
+
+    return _render(pdf_report.build_batch_summary, output_path, summary)
+
+
+def new_report_name():
+    """Nama file laporan baru (relatif terhadap MEDIA_ROOT)"""
+    return f"reports/Report_{uuid.uuid4()}.pdf"
+
+
+def save_report_data(history, check_results, sentence_count, threshold):
+    """Simpan data laporan ``history`` (dipanggil worker sebelum job selesai)"""
+    payload = {
+        'format': REPORT_FORMAT,
+        'threshold': threshold,
+        'sentence_count': sentence_count,
+        'check_results': check_results,
+    }
+    ReportData.objects.update_or_create(
+        history_id=history.id,
+        defaults={
+            'payload': json.dumps(payload, cls=DjangoJSONEncoder, ensure_ascii=False),
+            'rendered_at': None,
+        },
+    )
+
+
+def render_report(history):
+    """
+    Render PDF ``history`` dari ReportData ke ``history.report_file``.
+    Returns: path file, atau None jika data laporan tidak ada.
+    Raises: ReportRenderError jika render gagal (data tetap ada, bisa dicoba lagi).
+    """
+    from apps.plagiarism.status import touch_status
+
+    data = ReportData.objects.filter(history_id=history.id).first()
+    if data is None or not history.report_file:
+        return None
+    payload = json.loads(data.payload)
+
+    path = os.path.join(settings.MEDIA_ROOT, history.report_file.name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+
+    checked_at = None
+    if history.completed_at:
+        checked_at = timezone.localtime(history.completed_at).strftime('%d-%m-%Y %H:%M')
+    try:
+        rendered = render_pdf(
+            tmp_path,
+            history.filename,
+            payload['check_results'],
+            payload['threshold'],
+            sentence_count=payload['sentence_count'],
+            checked_at=checked_at,
+        )
+        if rendered is None:
+            raise ReportRenderError(f"Render laporan gagal: {history.filename}")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    ReportData.objects.filter(id=data.id).update(rendered_at=timezone.now())
+    if history.file_deleted:
+        # File sempat dibersihkan; laporan tersedia lagi
+        history.file_deleted = False
+        history.file_deleted_at = None
+        history.file_deleted_reason = None
+        history.save(update_fields=['file_deleted', 'file_deleted_at', 'file_deleted_reason'])
+        touch_status(history.user_id)
+
+    print(f"📄 Report rendered on demand: {history.filename}")
+    return path
+
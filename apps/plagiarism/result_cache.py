@@ -0,0 +1,126 @@
+"""
+Pemakaian ulang hasil pemeriksaan untuk dokumen yang identik.
+
+Dokumen dengan teks kanonik yang sama (``Document.content_hash``) yang
+diperiksa ulang dengan threshold, mode sumber, segmenter, dan versi index
+repository yang sama pasti menghasilkan pemeriksaan lokal yang sama, jadi
+``_process_worker`` cukup menyalin hasil sebelumnya.
+
+Invalidasi:
+- Threshold / mode sumber / segmenter berubah -> key berbeda.
+- Repository berubah (file diindeks ulang, ditambah, dihapus) ->
+  ``index_version`` berubah -> key berbeda.
+- Hasil internet bisa berubah seiring waktu -> entri kedaluwarsa setelah
+  settings.PLAGIARISM_RESULT_CACHE_DAYS hari dan dibersihkan oleh
+  ``cleanup_old_reports``.
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+
+from apps.plagiarism.models import CheckResultCache
+from apps.repository.models import RepositoryFile
+
+# Naikkan jika format check_results / algoritma pemeriksaan berubah
+CACHE_FORMAT = 1
+
+
+def _ttl_days():
+    return getattr(settings, 'PLAGIARISM_RESULT_CACHE_DAYS', 7)
+
+
+def index_version():
+    """
+    Sidik jari repository yang terindeks: jumlah file, waktu indexing
+    terakhir, dan total panjang teks. Berubah setiap ada file yang
+    diindeks, diindeks ulang, atau dihapus.
+    """
+    stats = RepositoryFile.objects.filter(status='indexed').aggregate(
+        count=Count('id'),
+        last=Max('index_date'),
+        length=Sum('extracted_text_length'),
+    )
+    last = stats['last'].isoformat() if stats['last'] else '-'
+    return f"{stats['count']}:{stats['length'] or 0}:{last}"
+
+
+def cache_key(document, threshold, source_mode, version):
+    segmenter = getattr(settings, 'PLAGIARISM_SENTENCE_SEGMENTER', 'regex')
+    raw = '|'.join(str(part) for part in (
+        CACHE_FORMAT, document.content_hash, threshold, source_mode, version, segmenter,
+    ))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def lookup(key):
+    """Entri cache yang masih berlaku untuk ``key``, atau None"""
+    cutoff = timezone.now() - timedelta(days=_ttl_days())
+    entry = CheckResultCache.objects.filter(key=key, created_at__gte=cutoff).first()
+    if entry is not None:
+        CheckResultCache.objects.filter(id=entry.id).update(
+            hit_count=F('hit_count') + 1, last_used_at=timezone.now()
+        )
+    return entry
+
+
+def load_results(entry):
+    return json.loads(entry.check_results)
+
+
+def store(key, document, threshold, source_mode, version, check_results, history):
+    """Simpan hasil pemeriksaan ``history`` (sudah punya report_file) ke cache"""
+    if _ttl_days() <= 0:
+        return None
+    CheckResultCache.objects.filter(key=key).delete()  # entri kedaluwarsa
+    try:
+        return CheckResultCache.objects.create(
+            key=key,
+            content_hash=document.content_hash,
+            threshold=threshold,
+            source_mode=source_mode,
+            index_version=version,
+            check_results=json.dumps(check_results, cls=DjangoJSONEncoder, ensure_ascii=False),
+            sentence_count=len(document),
+            report_file=history.report_file.name if history.report_file else None,
+            report_filename=history.filename,
+            report_user=history.user,
+        )
+    except IntegrityError:
+        return None  # worker lain menyimpan key yang sama lebih dulu
+
+
+def reuse_report(entry, history, dest_path):
+    """
+    Pakai ulang file laporan entri cache untuk ``history`` (hard link, atau
+    salin jika filesystem tidak mendukung). Hanya untuk user dan nama file
+    yang sama, karena laporan memuat nama file.
+    Returns True jika berhasil; False berarti laporan perlu dibuat ulang.
+    """
+    if not entry.report_file:
+        return False
+    if entry.report_user_id != history.user_id or entry.report_filename != history.filename:
+        return False
+
+    source = os.path.join(settings.MEDIA_ROOT, entry.report_file)
+    if not os.path.exists(source):
+        return False
+    try:
+        os.link(source, dest_path)
+    except OSError:
+        shutil.copyfile(source, dest_path)
+    return True
+
+
+def prune():
+    """Hapus entri kedaluwarsa. Returns: jumlah entri yang dihapus"""
+    cutoff = timezone.now() - timedelta(days=_ttl_days())
+    deleted, _ = CheckResultCache.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
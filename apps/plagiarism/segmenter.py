@@ -0,0 +1,129 @@
+"""
+Segmentasi kalimat rule-based untuk teks Bahasa Indonesia.
+
+Pengganti NLTK punkt (model bahasa Inggris): tidak butuh download data,
+jauh lebih cepat untuk dokumen panjang, dan memahami singkatan umum
+Indonesia (dll., dsb., S.Kom., Dr., ...).
+
+Kandidat batas kalimat dicari dengan satu regex terkompilasi: token yang
+diakhiri ``.``, ``!``, ``?`` atau ``…`` lalu diikuti whitespace/akhir teks.
+Setiap kandidat kemudian diputuskan dengan aturan sederhana:
+
+- Token gelar/sebutan (Dr., Prof., S.Kom., No., ...) tidak pernah memutus kalimat.
+- Singkatan penutup (dll., dsb., dst., dkk., ...) hanya memutus kalimat jika
+  diikuti huruf kapital.
+- Inisial satu huruf (``A.``) dan penomoran daftar di awal baris (``1.``)
+  tidak memutus kalimat.
+- Titik yang diikuti huruf kecil tidak memutus kalimat.
+
+Modul ini tidak bergantung pada Django.
+"""
+import re
+
+# Singkatan yang tidak pernah mengakhiri kalimat (gelar, sebutan, rujukan).
+# Disimpan dalam huruf kecil, termasuk titik terakhir.
+TITLE_ABBREVIATIONS = frozenset("""
+    dr. drs. dra. prof. ir. h. hj. kh. st. sdr. sdri. bpk. yth. tn. ny. nn.
+    s.kom. s.t. s.pd. s.e. s.h. s.si. s.sos. s.ip. s.ag. s.psi. s.ked. s.farm.
+    s.tr.kom. a.md. a.md.kom. m.kom. m.t. m.pd. m.m. m.si. m.sc. m.eng. m.h.
+    m.ag. m.e. m.ak. mba. ph.d. sp.a. sp.pd.
+    no. nomor. hal. hlm. vol. jl. kab. kec. kel. prov. rt. rw. tlp. telp.
+    gbr. tab. pers. ed. eds. cet. terj. ibid. op.cit. loc.cit.
+    a.n. u.p. u.b. s.d. d.a. c.q. q.q. vs. cf. e.g. i.e. et.
+    jan. feb. mar. apr. jun. jul. agu. agt. sep. sept. okt. nov. des.
+""".split())
+
+# Singkatan yang boleh mengakhiri kalimat jika diikuti huruf kapital.
+TERMINAL_ABBREVIATIONS = frozenset("""
+    dll. dsb. dst. dkk. tsb. dgn. yg. spt. al. etc.
+""".split())
+
+# Kandidat: token (tanpa whitespace) yang diakhiri tanda baca akhir,
+# opsional diikuti kutip/kurung tutup, lalu whitespace atau akhir teks.
+_CANDIDATE_RE = re.compile(r'(?<!\S)(\S*?)([.!?…]+)(["\'”’)\]]*)(?=\s|$)')
+_NEXT_CHAR_RE = re.compile(r'\s*(\S)')
+_ENUMERATION_RE = re.compile(r'(?:\d{1,2}|[a-zA-Z]|[ivxIVX]{1,4})')
+_WORD_CHAR_RE = re.compile(r'[^\W\d_]')
+
+MIN_SENTENCE_CHARS = 10
+MIN_SENTENCE_WORDS = 3
+MIN_LETTER_RATIO = 0.4
+
+
+def _is_boundary(text, match):
+    token = match.group(1).lstrip('("\'“‘[')
+    punct = match.group(2)
+
+    next_match = _NEXT_CHAR_RE.match(text, match.end())
+    if next_match is None:
+        return True  # akhir teks
+    next_char = next_match.group(1)
+
+    if punct != '.':
+        # ! ? … (atau ...) : batas kecuali langsung diikuti huruf kecil
+        return not next_char.islower()
+
+    word = token.lower() + '.'
+    if word in TITLE_ABBREVIATIONS:
+        return False
+    if word in TERMINAL_ABBREVIATIONS:
+        return next_char.isupper()
+
+    if len(token) == 1 and token.isalpha():
+        return False  # inisial nama: "A. Rahman"
+
+    if _ENUMERATION_RE.fullmatch(token):
+        # Penomoran daftar di awal baris: "1. Pendahuluan", "a. Tujuan"
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        if not text[line_start:match.start()].strip():
+            return False
+
+    return not next_char.islower()
+
+
+def split_spans(text):
+    """(awal, akhir) setiap kalimat, sudah di-strip, sesuai urutan teks"""
+    spans = []
+    start = 0
+    length = len(text)
+
+    for match in _CANDIDATE_RE.finditer(text):
+        if not _is_boundary(text, match):
+            continue
+        end = match.end()
+        _append_span(text, start, end, spans)
+        start = end
+
+    if start < length:
+        _append_span(text, start, length, spans)
+    return spans
+
+
+def _append_span(text, start, end, spans):
+    # Strip whitespace di kedua sisi tanpa membuat salinan string
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append((start, end))
+
+
+def split_sentences(text):
+    """Daftar kalimat (string) hasil split_spans"""
+    return [text[start:end] for start, end in split_spans(text)]
+
+
+def is_valid_sentence(sentence):
+    """
+    Filter kalimat yang layak diperiksa: minimal 10 karakter, 3 kata,
+    dan sebagian besar berupa huruf (membuang baris daftar isi "....... 12",
+    deretan angka tabel, dsb.).
+    """
+    if len(sentence) <= MIN_SENTENCE_CHARS:
+        return False
+    if len(sentence.split()) < MIN_SENTENCE_WORDS:
+        return False
+    letters = len(_WORD_CHAR_RE.findall(sentence))
+    visible = len(sentence) - sentence.count(' ') - sentence.count('\n')
+    return visible > 0 and letters / visible >= MIN_LETTER_RATIO
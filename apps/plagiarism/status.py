@@ -0,0 +1,221 @@
+"""
+Snapshot status job per user untuk halaman cek plagiasi.
+
+Snapshot (job aktif, 5 riwayat terbaru, sisa kuota) disimpan di cache
+bersama dan dibangun ulang oleh pihak yang mengubah state job — worker
+(claim, selesai, gagal, batal), reaper, upload, cancel, cleanup — lewat
+``touch_status``. ``check_status`` dan stream SSE cukup membaca cache:
+
+- Progress job aktif dibaca dari key progress ``ProgressReporter``, sehingga
+  update progress tidak perlu membangun ulang snapshot.
+- Snapshot yang memuat job menunggu mencatat token antrian. Jika antrian
+  bergeser (job lain masuk / diambil), hanya posisi antriannya yang
+  diperbarui saat dibaca, dari peta posisi bersama (``queue_positions``,
+  satu query per token antrian untuk semua user, bukan satu per user).
+- Snapshot dari hari sebelumnya dibangun ulang (kuota reset setiap hari).
+
+Konsistensi: ``touch_status`` mengganti token user SEBELUM membangun
+snapshot, dan snapshot menyimpan token yang dibaca sebelum query database.
+Snapshot hanya dipakai jika tokennya sama dengan token user saat ini, jadi
+snapshot yang dibangun dari data lama (dua perubahan bersamaan) tidak pernah
+disajikan. Token acak (bukan counter) dipakai karena increment
+DatabaseCache (get + set) tidak atomik.
+"""
+import uuid
+
+from django.core.cache import caches
+from django.utils import timezone
+
+from apps.history.models import PlagiarismHistory, UserUploadQuota
+from apps.plagiarism.progress import CACHE_ALIAS, progress_cache_key
+
+SNAPSHOT_TIMEOUT = 24 * 60 * 60
+QUEUE_KEY = 'plagiarism:status:queue'
+POSITIONS_KEY = 'plagiarism:status:queue:positions'
+ACTIVE_STATUSES = ('pending', 'processing')
+
+
+def _token():
+    return uuid.uuid4().hex[:16]
+
+
+def _user_key(user_id):
+    return f"plagiarism:status:user:{user_id}"
+
+
+def _snapshot_key(user_id):
+    return f"plagiarism:status:snapshot:{user_id}"
+
+
+def _today():
+    return timezone.now().date().isoformat()  # sama dengan tanggal kuota
+
+
+def _current_token(cache, key):
+    value = cache.get(key)
+    if value is None:
+        value = _token()
+        if not cache.add(key, value, SNAPSHOT_TIMEOUT):
+            value = cache.get(key) or value
+    return value
+
+
+def shared_queue_positions(cache, queue_token):
+    """
+    Posisi antrian semua job pending untuk ``queue_token`` (dibaca sebelum
+    query, seperti token user). Dihitung sekali per token lalu dipakai
+    bersama oleh semua user yang sedang menunggu.
+    """
+    from apps.plagiarism.job_queue import queue_positions
+
+    shared = cache.get(POSITIONS_KEY)
+    if shared and shared['token'] == queue_token:
+        return shared['positions']
+    positions = queue_positions()
+    cache.set(POSITIONS_KEY, {'token': queue_token, 'positions': positions}, SNAPSHOT_TIMEOUT)
+    return positions
+
+
+def build_snapshot(user):
+    """Bangun snapshot status ``user`` dari database dan simpan ke cache"""
+    cache = caches[CACHE_ALIAS]
+    # Token dibaca sebelum query (lihat docstring modul)
+    user_token = _current_token(cache, _user_key(user.id))
+    queue_token = _current_token(cache, QUEUE_KEY)
+
+    history = PlagiarismHistory.objects.filter(user_id=user.id, batch__isnull=True)
+    recent_processes = list(history.order_by('-check_date')[:5])
+    if any(process.status in ACTIVE_STATUSES for process in recent_processes):
+        has_active = True
+    else:
+        has_active = history.filter(status__in=ACTIVE_STATUSES).exists()
+
+    positions = {}
+    if any(process.status == 'pending' for process in recent_processes):
+        positions = shared_queue_positions(cache, queue_token)
+
+    processes = []
+    for process in recent_processes:
+        processes.append({
+            'id': str(process.id),
+            'filename': process.filename,
+            'status': process.status,
+            'progress': process.progress,
+            'queue_position': positions.get(str(process.id)) if process.status == 'pending' else None,
+            'cancel_requested': process.cancel_requested,
+            'similarity_score': process.similarity_score,
+            'error_message': process.error_message,
+            'file_deleted': process.file_deleted,
+            'file_deleted_reason': process.file_deleted_reason,
+            # Dari state tersimpan; file yang ternyata hilang ditandai
+            # file_deleted oleh download_report
+            'can_download': bool(
+                process.status == 'completed'
+                and process.report_file
+                and not process.file_deleted
+            ),
+        })
+
+    waiting = any(p['queue_position'] for p in processes)
+    snapshot = {
+        'id': _token(),
+        'token': user_token,
+        'queue': queue_token if waiting else None,
+        'day': _today(),
+        'data': {
+            'has_active': has_active,
+            'remaining_quota': UserUploadQuota.get_remaining_quota(user),
+            'processes': processes,
+        },
+    }
+    cache.set(_snapshot_key(user.id), snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def touch_status(user, queue=False):
+    """
+    Dipanggil setelah state job ``user`` berubah (queue=True: antrian ikut
+    berubah). Mengganti token lalu membangun ulang snapshot.
+    ``user`` boleh objek User atau user_id.
+    """
+    from django.contrib.auth import get_user_model
+
+    try:
+        cache = caches[CACHE_ALIAS]
+        user_id = getattr(user, 'pk', user)
+        values = {_user_key(user_id): _token()}
+        if queue:
+            values[QUEUE_KEY] = _token()
+        cache.set_many(values, SNAPSHOT_TIMEOUT)
+
+        if not hasattr(user, 'upload_limit'):
+            user = get_user_model().objects.get(pk=user_id)
+        build_snapshot(user)
+    except Exception as e:
+        print(f"⚠️  Gagal memperbarui snapshot status: {e}")
+
+
+def current_status(user):
+    """
+    Status job user untuk check_status / status_stream.
+    Tanpa query database selama snapshot masih berlaku.
+    Returns: (etag, data)
+    """
+    cache = caches[CACHE_ALIAS]
+    user_key, snapshot_key = _user_key(user.id), _snapshot_key(user.id)
+    values = cache.get_many([user_key, snapshot_key, QUEUE_KEY])
+    snapshot = values.get(snapshot_key)
+
+    if not (
+        snapshot
+        and snapshot['token'] == values.get(user_key)
+        and snapshot['day'] == _today()
+    ):
+        snapshot = build_snapshot(user)
+    elif snapshot['queue'] is not None and snapshot['queue'] != values.get(QUEUE_KEY):
+        snapshot = _refresh_positions(cache, user, snapshot)
+
+    data = snapshot['data']
+    active = [p for p in data['processes'] if p['status'] in ACTIVE_STATUSES]
+    if active:
+        cached = cache.get_many([progress_cache_key(p['id']) for p in active])
+        for process in active:
+            live = cached.get(progress_cache_key(process['id']))
+            if live is not None:
+                # Cache = percobaan yang sedang berjalan (dihapus saat claim / requeue)
+                process['progress'] = live
+
+    etag = '-'.join([snapshot['id']] + [str(p['progress']) for p in active])
+    return etag, data
+
+
+def _refresh_positions(cache, user, snapshot):
+    """Antrian bergeser: perbarui posisi job menunggu dari peta bersama"""
+    queue_token = _current_token(cache, QUEUE_KEY)
+    positions = shared_queue_positions(cache, queue_token)
+    waiting = [p for p in snapshot['data']['processes'] if p['queue_position']]
+    if any(p['id'] not in positions for p in waiting):
+        # Job sudah diambil / selesai tapi token user belum berganti: bangun ulang
+        return build_snapshot(user)
+
+    changed = False
+    for process in waiting:
+        position = positions[process['id']]
+        if position != process['queue_position']:
+            process['queue_position'] = position
+            changed = True
+    if changed:
+        snapshot['id'] = _token()
+    snapshot['queue'] = queue_token
+    cache.set(_snapshot_key(user.id), snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def etag_matches(etag, current):
+    """Bandingkan If-None-Match / Last-Event-ID dengan ETag saat ini"""
+    if not etag:
+        return False
+    etag = etag.strip()
+    if etag.startswith('W/'):
+        etag = etag[2:]
+    return etag.strip('"') == current
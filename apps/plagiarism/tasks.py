@@ -1,32 +1,73 @@
-import threading
 import os
-import uuid
 from django.conf import settings
 from django.utils import timezone
 from apps.history.models import PlagiarismHistory
 from .services import PlagiarismService
+from . import result_cache
+from .checkpoints import CheckpointStore, clear_checkpoints
+from .job_queue import CancelToken, CheckCancelled, enqueue, finish_cancelled
+from .progress import ProgressReporter
+from .reporting import new_report_name, save_report_data
+from .status import touch_status
+from .batch import BatchSentenceCache, finalize_batch
+from .collusion import store_fingerprint
+
+def _claimed(history_id, worker_id):
+    """
+    Baris job selama masih di-claim ``worker_id``. Worker yang claim-nya
+    sudah diambil alih (reaper mengembalikan job ke antrian) tidak boleh
+    menimpa hasil atau menghapus file input worker baru.
+    worker_id None = dipanggil di luar antrian, tanpa guard.
+    """
+    rows = PlagiarismHistory.objects.filter(id=history_id)
+    if worker_id is not None:
+        rows = rows.filter(claimed_by=worker_id)
+    return rows
+
+
+def _mark_failed(history_id, worker_id, file_path, error_msg):
+    failed = _claimed(history_id, worker_id).update(
+        status='failed',
+        input_path=None,
+        error_message=error_msg,
+        completed_at=timezone.now(),
+    )
+    if not failed:
+        print(f"⚠️  Job {history_id} no longer claimed by {worker_id}, failure not recorded")
+        return
+    clear_checkpoints(history_id)
+    if file_path and os.path.exists(file_path):
+        os.remove(file_path)
+
 
 class PlagiarismTask:
     
     @staticmethod
-    def process_document(history_id, file_path, source_mode):
-        thread = threading.Thread(
-            target=PlagiarismTask._process_worker,
-            args=(history_id, file_path, source_mode),
-            daemon=True
-        )
-        thread.start()
-        return thread
+    def process_document(history_id, file_path, source_mode, priority=None):
+        """
+        Masukkan dokumen ke antrian database; diproses oleh worker pool
+        berukuran tetap (settings.PLAGIARISM_WORKER_CONCURRENCY).
+        priority None = otomatis dari ukuran file (lihat job_queue.job_priority).
+        """
+        enqueue(history_id, file_path, priority)
     
     @staticmethod
-    def _process_worker(history_id, file_path, source_mode):
+    def _process_worker(history_id, file_path, source_mode, worker_id=None):
+        """worker_id: claimed_by job ini; semua penulisan akhir dijaga claim tersebut"""
         history = None
         try:
             history = PlagiarismHistory.objects.get(id=history_id)
             history.status = 'processing'
             history.started_at = timezone.now()
             history.progress = 0
-            history.save()
+            if not _claimed(history_id, worker_id).update(
+                status=history.status, started_at=history.started_at, progress=0
+            ):
+                print(f"⚠️  Job {history_id} no longer claimed by {worker_id}, skipped")
+                history = None
+                return
+            cancel_token = CancelToken(history_id, worker_id=worker_id)
+            progress = ProgressReporter(history_id)
             
             print(f"\n{'='*60}")
             print(f"🔍 Starting plagiarism check: {history.filename}")
@@ -35,35 +76,32 @@ class PlagiarismTask:
             print(f"{'='*60}\n")
             
             service = PlagiarismService()
+            if history.batch_id:
+                service.sentence_cache = BatchSentenceCache(history.batch_id, source_mode, service.threshold)
             
             # Step 1: Extract text
             print("📄 Step 1: Extracting text from document...")
             file_ext = os.path.splitext(file_path)[1].lower()
             
             try:
-                raw_text = service.extract_text(file_path, file_ext)
+                document = service.extract_document(file_path, file_ext)
             except ValueError as ve:
                 # User-friendly error messages
                 raise ValueError(str(ve))
             except Exception as e:
                 raise ValueError(f"Gagal membaca file: {str(e)}")
             
-            if not raw_text or not raw_text.strip():
+            if not document.text:
                 raise ValueError("Tidak dapat mengekstrak teks dari dokumen. File mungkin kosong atau rusak.")
             
-            print(f"✅ Text extracted: {len(raw_text)} characters")
+            print(f"✅ Text extracted: {len(document.text)} characters")
             
-            history.progress = 10
-            history.save()
+            progress.set(10, force=True)
+            cancel_token.check(force=True)
             
-            # Step 2: Tokenize
+            # Step 2: Tokenize (sekali, dibawa Document ke langkah berikutnya)
             print("\n🔤 Step 2: Tokenizing sentences...")
-            try:
-                sentences = service.tokenize(raw_text)
-            except Exception as e:
-                raise ValueError(f"Gagal memproses teks: {str(e)}")
-            
-            total_sentences = len(sentences)
+            total_sentences = len(document)
             
             if total_sentences == 0:
                 raise ValueError(
@@ -73,17 +111,37 @@ class PlagiarismTask:
             
             print(f"✅ Found {total_sentences} valid sentences")
             
-            history.progress = 20
-            history.save()
+            if history.batch_id:
+                # Shingle untuk perbandingan antar dokumen batch
+                store_fingerprint(history, document)
+            
+            progress.set(20, force=True)
             
-            # Step 3: Check plagiarism
+            # Step 3: Check plagiarism (atau pakai ulang hasil dokumen identik)
             print(f"\n🔍 Step 3: Checking plagiarism ({source_mode} mode)...")
             print(f"   Threshold: {service.threshold}%")
             
-            try:
-                check_results = service.process_check(raw_text, source_mode)
-            except Exception as e:
-                raise ValueError(f"Error saat pemeriksaan plagiarisme: {str(e)}")
+            index_version = result_cache.index_version()
+            cache_key = result_cache.cache_key(document, service.threshold, source_mode, index_version)
+            cached = result_cache.lookup(cache_key)
+            
+            if cached is not None:
+                print(f"♻️  Reusing cached result ({cached.content_hash[:12]}, {cached.hit_count + 1} hit)")
+                check_results = result_cache.load_results(cached)
+            else:
+                checkpoint = CheckpointStore(
+                    history.id, document, service.threshold, source_mode, service.chunk_size,
+                    index_version,
+                )
+                try:
+                    check_results = service.process_check(
+                        document, source_mode, checkpoint, cancel_token,
+                        on_progress=progress.stage(20, 80),
+                    )
+                except CheckCancelled:
+                    raise
+                except Exception as e:
+                    raise ValueError(f"Error saat pemeriksaan plagiarisme: {str(e)}")
             
             plagiarized_count = len(check_results['results'])
             print(f"✅ Check completed:")
@@ -92,34 +150,22 @@ class PlagiarismTask:
             print(f"   - Local similarity: {check_results['similarity_local']}%")
             print(f"   - Internet similarity: {check_results['similarity_internet']}%")
             
-            history.progress = 80
-            history.save()
-            
-            # Step 4: Generate report
-            print("\n📊 Step 4: Generating PDF report...")
-            reports_dir = os.path.join(settings.MEDIA_ROOT, 'reports')
-            os.makedirs(reports_dir, exist_ok=True)
+            progress.set(80, force=True)
             
-            report_filename = f"Report_{uuid.uuid4()}.pdf"
-            report_path = os.path.join(reports_dir, report_filename)
+            cancel_token.check(force=True)
             
-            try:
-                final_report = service.generate_pdf_report(
-                    raw_text,
-                    check_results,
-                    report_path,
-                    history.filename
-                )
-            except Exception as e:
-                raise ValueError(f"Gagal membuat laporan PDF: {str(e)}")
+            # Step 4: Simpan data laporan; PDF dirender saat pertama diunduh
+            print("\n📊 Step 4: Saving report data...")
+            report_name = new_report_name()
+            report_path = os.path.join(settings.MEDIA_ROOT, report_name)
+            os.makedirs(os.path.dirname(report_path), exist_ok=True)
             
-            if final_report is None:
-                raise ValueError("Gagal membuat laporan PDF. Silakan coba lagi.")
+            if cached is not None and result_cache.reuse_report(cached, history, report_path):
+                print(f"♻️  Reusing cached PDF report: {report_name}")
             
-            print(f"✅ PDF report created: {report_filename}")
+            save_report_data(history, check_results, total_sentences, service.threshold)
             
-            history.progress = 95
-            history.save()
+            progress.set(95, force=True)
             
             # Step 5: Save results
             print("\n💾 Step 5: Saving results...")
@@ -129,17 +175,42 @@ class PlagiarismTask:
             
             # Save matched sources as JSON string (TextField compatible)
             import json
+            from django.core.serializers.json import DjangoJSONEncoder
             matched_sources = {
                 'local': check_results['local_sources'],
                 'internet': check_results['internet_sources']
             }
-            history.matched_sources = json.dumps(matched_sources, ensure_ascii=False)
+            history.matched_sources = json.dumps(matched_sources, cls=DjangoJSONEncoder, ensure_ascii=False)
             
-            history.report_file = f"reports/{report_filename}"
+            history.report_file = report_name
+            history.input_path = None
             history.status = 'completed'
             history.progress = 100
             history.completed_at = timezone.now()
-            history.save()
+            completed = _claimed(history_id, worker_id).update(
+                similarity_score=history.similarity_score,
+                similarity_local=history.similarity_local,
+                similarity_internet=history.similarity_internet,
+                matched_sources=history.matched_sources,
+                report_file=report_name,
+                input_path=None,
+                status='completed',
+                progress=100,
+                completed_at=history.completed_at,
+            )
+            if not completed:
+                # Job sudah diambil worker lain: hasil dan file input milik worker itu
+                print(f"⚠️  Job {history_id} no longer claimed by {worker_id}, result discarded")
+                if os.path.exists(report_path):
+                    os.remove(report_path)
+                return
+            clear_checkpoints(history_id)
+            
+            if cached is None:
+                result_cache.store(
+                    cache_key, document, service.threshold, source_mode,
+                    index_version, check_results, history
+                )
             
             # Cleanup temp file
             if os.path.exists(file_path):
@@ -152,18 +223,18 @@ class PlagiarismTask:
             print(f"   Duration: {(history.completed_at - history.started_at).total_seconds():.1f}s")
             print(f"{'='*60}\n")
             
+        except CheckCancelled:
+            print(f"\n🛑 CANCELLED: {history.filename}\n")
+            finish_cancelled(history, worker_id)
+            
         except ValueError as ve:
             # User-friendly errors (already formatted)
             error_msg = str(ve)
             print(f"\n❌ USER ERROR: {error_msg}\n")
             
             if history:
-                history.status = 'failed'
-                history.error_message = error_msg
-                history.completed_at = timezone.now()
-                history.save()
-            
-            if file_path and os.path.exists(file_path):
+                _mark_failed(history_id, worker_id, file_path, error_msg)
+            elif file_path and os.path.exists(file_path):
                 os.remove(file_path)
                 
         except Exception as e:
@@ -175,10 +246,17 @@ class PlagiarismTask:
             print()
             
             if history:
-                history.status = 'failed'
-                history.error_message = error_msg
-                history.completed_at = timezone.now()
-                history.save()
-            
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
\ No newline at end of file
+                _mark_failed(history_id, worker_id, file_path, error_msg)
+            elif file_path and os.path.exists(file_path):
+                os.remove(file_path)
+        
+        finally:
+            if history is not None:
+                touch_status(history.user_id)
+            
+            # Item batch terakhir yang selesai membuat laporan ringkasan
+            if history is not None and history.batch_id:
+                try:
+                    finalize_batch(history.batch_id)
+                except Exception as e:
+                    print(f"❌ Batch finalize error: {e}")
@@ -1,3 +1,330 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+import uuid
+import zipfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.history.models import PlagiarismHistory, UserUploadQuota
+from apps.plagiarism import job_queue
+from apps.plagiarism.collusion import find_suspicious_pairs, pack_shingles, unpack_shingles
+from apps.plagiarism.downloads import parse_range
+from apps.plagiarism.progress import CACHE_ALIAS, progress_cache_key
+from apps.plagiarism.uploads import UploadRejected, discard_blobs, store_stream
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'plagiarism': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'plagiarism-tests'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JobTestCase(TestCase):
+    """Dasar test antrian: user + file input sementara"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.alice = User.objects.create_user('alice', password='x')
+        cls.bob = User.objects.create_user('bob', password='x')
+
+    def setUp(self):
+        handle, self.input_path = tempfile.mkstemp(suffix='.txt')
+        os.close(handle)
+        self.addCleanup(lambda: os.path.exists(self.input_path) and os.remove(self.input_path))
+
+    def make_job(self, user=None, filename_suffix=None, **fields):
+        fields.setdefault('input_path', self.input_path)
+        filename = f"dokumen-{filename_suffix}.txt" if filename_suffix else 'dokumen.txt'
+        return PlagiarismHistory.objects.create(user=user or self.alice, filename=filename, **fields)
+
+
+class ClaimNextTests(JobTestCase):
+    def test_claim_marks_job_processing(self):
+        job = self.make_job()
+
+        claimed = job_queue.claim_next('w1')
+
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, 'processing')
+        self.assertEqual(claimed.claimed_by, 'w1')
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNotNone(claimed.heartbeat_at)
+        self.assertIsNone(job_queue.claim_next('w2'))
+
+    def test_job_without_input_is_not_claimed(self):
+        self.make_job(input_path=None)
+
+        self.assertIsNone(job_queue.claim_next('w1'))
+
+
+class SchedulingTests(JobTestCase):
+    def claim_order(self):
+        order = []
+        while (job := job_queue.claim_next('w1')) is not None:
+            order.append(job.filename)
+        return order
+
+    def test_higher_priority_first(self):
+        self.make_job(filename_suffix='normal')
+        self.make_job(filename_suffix='high', priority=job_queue.PRIORITY_HIGH)
+
+        self.assertEqual(self.claim_order(), ['dokumen-high.txt', 'dokumen-normal.txt'])
+
+    def test_users_take_turns(self):
+        for i in range(3):
+            self.make_job(filename_suffix=f"alice{i}")
+        self.make_job(user=self.bob, filename_suffix='bob0')
+
+        order = self.claim_order()
+        self.assertEqual(order[0], 'dokumen-alice0.txt')
+        self.assertEqual(order[1], 'dokumen-bob0.txt')
+
+    def test_queue_positions_follow_claim_order(self):
+        jobs = [self.make_job(filename_suffix=f"alice{i}") for i in range(2)]
+        bob = self.make_job(user=self.bob, filename_suffix='bob0')
+
+        positions = job_queue.queue_positions()
+        self.assertEqual(positions[str(jobs[0].id)], 1)
+        self.assertEqual(positions[str(bob.id)], 2)
+        self.assertEqual(positions[str(jobs[1].id)], 3)
+        by_position = sorted(positions, key=positions.get)
+        names = dict(PlagiarismHistory.objects.values_list('id', 'filename'))
+        self.assertEqual([names[uuid.UUID(job_id)] for job_id in by_position], self.claim_order())
+
+
+class ProgressCacheTests(JobTestCase):
+    def test_claim_and_requeue_drop_previous_attempt_progress(self):
+        job = self.make_job()
+        cache = caches[CACHE_ALIAS]
+        cache.set(progress_cache_key(job.id), 90)
+
+        job_queue.claim_next('w1')
+        self.assertIsNone(cache.get(progress_cache_key(job.id)))
+
+        cache.set(progress_cache_key(job.id), 60)
+        PlagiarismHistory.objects.filter(id=job.id).update(heartbeat_at=timezone.now() - timedelta(minutes=10))
+        job_queue.reap_stale_jobs(heartbeat_timeout=120)
+        self.assertIsNone(cache.get(progress_cache_key(job.id)))
+
+
+class ReapStaleJobsTests(JobTestCase):
+    def test_dead_heartbeat_is_requeued(self):
+        old = timezone.now() - timedelta(minutes=10)
+        job = self.make_job(status='processing', claimed_by='w1', claimed_at=old, heartbeat_at=old, attempts=1)
+
+        decisions = job_queue.reap_stale_jobs(heartbeat_timeout=120)
+
+        self.assertEqual([(job.id, 'requeue')], [(d[0], d[1]) for d in decisions])
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        self.assertIsNone(job.claimed_by)
+        self.assertEqual(job.progress, 0)
+
+    def test_long_running_job_with_live_heartbeat_is_left_alone(self):
+        now = timezone.now()
+        job = self.make_job(
+            status='processing', claimed_by='w1', attempts=1,
+            claimed_at=now - timedelta(hours=5), heartbeat_at=now - timedelta(seconds=5),
+        )
+
+        self.assertEqual(job_queue.reap_stale_jobs(heartbeat_timeout=120), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'processing')
+        self.assertEqual(job.claimed_by, 'w1')
+
+    def test_exhausted_attempts_fail(self):
+        old = timezone.now() - timedelta(minutes=10)
+        job = self.make_job(status='processing', claimed_by='w1', claimed_at=old, heartbeat_at=old, attempts=3)
+
+        job_queue.reap_stale_jobs(heartbeat_timeout=120)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIsNone(job.input_path)
+
+    def test_dry_run_changes_nothing(self):
+        old = timezone.now() - timedelta(minutes=10)
+        job = self.make_job(status='processing', claimed_by='w1', claimed_at=old, heartbeat_at=old, attempts=1)
+
+        self.assertEqual(len(job_queue.reap_stale_jobs(heartbeat_timeout=120, dry_run=True)), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'processing')
+
+    def test_cancel_token_stops_worker_that_lost_its_claim(self):
+        job = self.make_job(status='processing', claimed_by='w2')
+
+        self.assertTrue(job_queue.CancelToken(job.id, worker_id='w1').is_cancelled(force=True))
+        self.assertFalse(job_queue.CancelToken(job.id, worker_id='w2').is_cancelled(force=True))
+
+
+def _chunks(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class StoreStreamTests(TestCase):
+    PDF = b'%PDF-1.4\n' + b'x' * 5000 + b'\n%%EOF\n'
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.temp_dir = os.path.join(self.media, 'temp')
+
+    def test_pdf_in_small_chunks_is_stored_once(self):
+        first = store_stream(_chunks(self.PDF, 7), 'a.pdf', '.pdf', link_dir=self.temp_dir)
+        again = store_stream(_chunks(self.PDF, 4096), 'b.pdf', '.pdf', link_dir=self.temp_dir)
+
+        self.assertTrue(first['created'])
+        self.assertFalse(again['created'])
+        self.assertEqual(first['path'], again['path'])
+        self.assertEqual(first['size'], len(self.PDF))
+        with open(again['job_path'], 'rb') as job_file:
+            self.assertEqual(job_file.read(), self.PDF)
+
+    def test_truncated_pdf_is_rejected(self):
+        with self.assertRaises(UploadRejected):
+            store_stream(_chunks(self.PDF[:-10], 512), 'a.pdf', '.pdf')
+
+    def test_extension_must_match_content(self):
+        with self.assertRaisesMessage(UploadRejected, 'adalah PDF, bukan DOCX'):
+            store_stream([self.PDF], 'a.docx', '.docx')
+
+    def test_docx_needs_document_xml(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', '<w:document/>')
+        self.assertEqual(store_stream([buffer.getvalue()], 'a.docx', '.docx')['ext'], '.docx')
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('readme.txt', 'bukan docx')
+        with self.assertRaises(UploadRejected):
+            store_stream([buffer.getvalue()], 'b.docx', '.docx')
+
+    def test_discard_keeps_blob_linked_by_another_upload(self):
+        first = store_stream([self.PDF], 'a.pdf', '.pdf', link_dir=self.temp_dir)
+        other = store_stream([self.PDF], 'b.pdf', '.pdf', link_dir=self.temp_dir)
+
+        discard_blobs([first])
+
+        self.assertFalse(os.path.exists(first['job_path'] or ''))
+        self.assertTrue(os.path.exists(first['path']))
+        self.assertTrue(os.path.exists(other['job_path']))
+
+    def test_discard_removes_unreferenced_blob(self):
+        blob = store_stream([self.PDF], 'a.pdf', '.pdf', link_dir=self.temp_dir)
+        job_path = blob['job_path']
+
+        discard_blobs([blob])
+
+        self.assertFalse(os.path.exists(job_path))
+        self.assertFalse(os.path.exists(blob['path']))
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PLAGIARISM_WORKER_MODE='external')
+class UploadViewTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = get_user_model().objects.create_superuser('admin', password='x', upload_limit=1)
+        self.client.force_login(self.user)
+
+    def post(self, *contents):
+        files = [
+            SimpleUploadedFile(f"dokumen{i}.pdf", content, content_type='application/pdf')
+            for i, content in enumerate(contents)
+        ]
+        return self.client.post(reverse('admin:plagiarism_check_tool'), {
+            'input_type': 'file', 'source_mode': 'local', 'document_file': files,
+        })
+
+    def cas_files(self):
+        return [name for _, _, names in os.walk(os.path.join(self.media, 'cas')) for name in names]
+
+    def test_upload_creates_job_and_charges_quota(self):
+        self.post(StoreStreamTests.PDF)
+
+        job = PlagiarismHistory.objects.get(user=self.user)
+        self.assertTrue(os.path.exists(job.input_path))
+        self.assertEqual(UserUploadQuota.objects.get(user=self.user).upload_count, 1)
+
+    def test_over_quota_upload_leaves_nothing_behind(self):
+        self.post(StoreStreamTests.PDF, StoreStreamTests.PDF.replace(b'x', b'y'))
+
+        self.assertFalse(PlagiarismHistory.objects.exists())
+        self.assertFalse(UserUploadQuota.objects.filter(user=self.user).exists())
+        self.assertEqual(self.cas_files(), [])
+        self.assertEqual(os.listdir(os.path.join(self.media, 'temp')), [])
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        cases = [
+            ('bytes=0-99', (0, 99)),
+            ('bytes=100-', (100, 999)),
+            ('bytes=-100', (900, 999)),
+            ('bytes=-5000', (0, 999)),
+            ('bytes=900-5000', (900, 999)),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1000), expected)
+
+    def test_ignored_headers(self):
+        for header in (None, '', 'items=0-9', 'bytes=0-9,20-29', 'bytes=abc-', 'bytes=5', 'bytes=9-3'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 1000))
+
+    def test_unsatisfiable(self):
+        for header, size in (('bytes=1000-', 1000), ('bytes=2000-3000', 1000), ('bytes=-0', 1000), ('bytes=0-', 0)):
+            with self.subTest(header=header, size=size):
+                self.assertEqual(parse_range(header, size), 'unsatisfiable')
+
+
+class CollusionTests(SimpleTestCase):
+    def test_copied_pair_is_found(self):
+        fingerprints = {
+            'a': set(range(0, 100)),
+            'b': set(range(10, 110)),      # 90 shingle sama dengan a
+            'c': set(range(1000, 1100)),   # tidak berhubungan
+        }
+
+        pairs = find_suspicious_pairs(fingerprints, min_jaccard=0.1, min_containment=0.5, max_df=1.0)
+
+        self.assertEqual(len(pairs), 1)
+        pair = pairs[0]
+        self.assertEqual((pair['a'], pair['b'], pair['shared']), ('a', 'b', 90))
+        self.assertEqual(pair['jaccard'], round(90 / 110 * 100, 1))
+        self.assertEqual(pair['containment'], 90.0)
+
+    def test_partial_copy_caught_by_containment(self):
+        fingerprints = {'long': set(range(0, 1000)), 'short': set(range(0, 60)) | {5000, 5001}}
+
+        pairs = find_suspicious_pairs(fingerprints, min_jaccard=0.5, min_containment=0.5, max_df=1.0)
+
+        self.assertEqual([(p['a'], p['b']) for p in pairs], [('long', 'short')])
+        self.assertLess(pairs[0]['jaccard'], 50)
+
+    def test_shared_template_is_ignored(self):
+        template = set(range(500, 600))  # soal tugas yang dikutip semua mahasiswa
+        fingerprints = {name: template | set(range(10000 * (i + 1), 10000 * (i + 1) + 100)) for i, name in enumerate('abcdef')}
+
+        self.assertEqual(find_suspicious_pairs(fingerprints, min_jaccard=0.1, min_containment=0.5, max_df=0.5), [])
+
+    def test_pack_round_trip(self):
+        hashes = [0, 1, 2 ** 63, 2 ** 64 - 1]
+        self.assertEqual(list(unpack_shingles(pack_shingles(hashes))), hashes)
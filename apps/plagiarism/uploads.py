@@ -0,0 +1,212 @@
+"""
+Penyimpanan upload content-addressed (``media/cas/ab/<sha256><ext>``).
+
+Setiap file upload di-stream satu kali: sha256 dihitung dan magic bytes
+diperiksa sambil menulis ke CAS.
+- PDF : ``%PDF-`` di 1 KB pertama dan ``%%EOF`` di 1 KB terakhir
+        (file terpotong ditolak)
+- DOCX: signature zip ``PK\\x03\\x04`` dan ``word/document.xml`` di central
+        directory
+File rusak atau yang isinya tidak sesuai ekstensi ditolak (``UploadRejected``)
+sebelum memakai kuota dan slot antrian. File dengan isi yang sama hanya
+disimpan sekali.
+
+Job tidak memakai blob CAS secara langsung: setiap job mendapat hard link
+sendiri di ``media/temp/`` (fallback: salinan), sehingga worker tetap bebas
+menghapus file input job-nya. Jumlah link (``st_nlink``) berfungsi sebagai
+reference count: ``prune_cas`` hanya menghapus blob yang tidak lagi
+direferensikan job mana pun. Link job dibuat di dalam ``store_stream``
+(``link_dir``), jadi blob yang dipakai ulang sudah ter-link sebelum upload
+lain yang ditolak sempat membuangnya (``discard_blobs``).
+"""
+import hashlib
+import os
+import shutil
+import time
+import uuid
+import zipfile
+
+from django.conf import settings
+
+CHUNK_SIZE = 1024 * 1024
+SNIFF_BYTES = 1024
+PRUNE_GRACE_SECONDS = 60 * 60  # blob baru belum tentu sudah di-link ke job
+PUBLISH_ATTEMPTS = 3
+
+
+class UploadRejected(ValueError):
+    """File upload tidak valid (rusak / bukan PDF/DOCX sungguhan)"""
+
+
+def cas_root():
+    return os.path.join(settings.MEDIA_ROOT, 'cas')
+
+
+def _blob_path(sha256, ext):
+    return os.path.join(cas_root(), sha256[:2], f"{sha256}{ext}")
+
+
+def _sniff(head, tail):
+    """Tipe file dari magic bytes: '.pdf', '.docx' (kandidat zip), atau None"""
+    if b'%PDF-' in head[:SNIFF_BYTES]:
+        return '.pdf' if b'%%EOF' in tail else None
+    if head.startswith(b'PK\x03\x04'):
+        return '.docx'
+    return None
+
+
+def _is_docx(path):
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return 'word/document.xml' in archive.namelist()
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+
+def _publish(tmp_path, path, link_dir):
+    """
+    Simpan blob ke CAS (jika belum ada) lalu buat link job di ``link_dir``.
+    Blob dibuat dengan os.link (gagal jika sudah ada, tanpa menimpa). Jika
+    blob yang sudah ada terhapus sebelum sempat di-link (upload lain yang
+    ditolak membuang blob buatannya), blob ditulis ulang dari file sementara.
+    Returns: (created, job_path)
+    """
+    for attempt in range(PUBLISH_ATTEMPTS):
+        created = False
+        if not os.path.exists(path):
+            try:
+                os.link(tmp_path, path)
+                created = True
+            except FileExistsError:
+                pass
+            except OSError:
+                shutil.copyfile(tmp_path, path)  # filesystem tanpa hard link
+                created = True
+        if not created:
+            os.utime(path)  # blob dipakai lagi: tunda prune
+        if link_dir is None:
+            return created, None
+        try:
+            return created, link_for_job(path, link_dir)
+        except FileNotFoundError:
+            if attempt == PUBLISH_ATTEMPTS - 1:
+                raise
+
+
+def store_stream(chunks, name, declared_ext, link_dir=None):
+    """
+    Tulis ``chunks`` (iterable bytes) ke CAS sambil menghitung sha256 dan
+    memeriksa magic bytes dalam satu pass.
+    link_dir: jika diisi, sekalian buat file input job (``job_path``).
+    Returns: dict (sha256, path, ext, size, created, job_path). ``created``
+    False jika blob yang sama sudah ada di CAS. Raises: UploadRejected
+    """
+    root = cas_root()
+    os.makedirs(root, exist_ok=True)
+    tmp_path = os.path.join(root, f".upload-{uuid.uuid4()}")
+
+    digest = hashlib.sha256()
+    head = b''
+    tail = b''
+    size = 0
+    try:
+        with open(tmp_path, 'wb') as destination:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                digest.update(chunk)
+                if len(head) < SNIFF_BYTES:
+                    head += chunk[:SNIFF_BYTES - len(head)]
+                tail = (tail + chunk[-SNIFF_BYTES:])[-SNIFF_BYTES:]
+                size += len(chunk)
+                destination.write(chunk)
+
+        if size == 0:
+            raise UploadRejected(f"File '{name}' kosong.")
+
+        sniffed = _sniff(head, tail)
+        if sniffed == '.docx' and not _is_docx(tmp_path):
+            sniffed = None
+        if sniffed is None:
+            raise UploadRejected(f"File '{name}' rusak atau bukan PDF/DOCX yang valid.")
+        if sniffed != declared_ext:
+            raise UploadRejected(
+                f"Isi file '{name}' adalah {sniffed.upper()[1:]}, bukan {declared_ext.upper()[1:]}."
+            )
+
+        sha256 = digest.hexdigest()
+        path = _blob_path(sha256, sniffed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        created, job_path = _publish(tmp_path, path, link_dir)
+        return {
+            'sha256': sha256, 'path': path, 'ext': sniffed, 'size': size,
+            'created': created, 'job_path': job_path,
+        }
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def store_upload(uploaded_file, link_dir=None):
+    """store_stream untuk UploadedFile Django"""
+    ext = os.path.splitext(uploaded_file.name)[1].lower()
+    return store_stream(uploaded_file.chunks(CHUNK_SIZE), uploaded_file.name, ext, link_dir)
+
+
+def discard_job_file(blob):
+    """Hapus file input job (``job_path``) milik blob hasil store_stream"""
+    job_path = blob.get('job_path')
+    if job_path and os.path.exists(job_path):
+        os.remove(job_path)
+    blob['job_path'] = None
+
+
+def discard_blobs(blobs):
+    """
+    Buang hasil store_stream dari upload yang akhirnya ditolak: file input
+    job-nya, lalu blob CAS yang dibuat upload itu sendiri selama tidak
+    di-link job lain.
+    """
+    for blob in blobs:
+        try:
+            discard_job_file(blob)
+            if blob.get('created') and os.stat(blob['path']).st_nlink <= 1:
+                os.remove(blob['path'])
+        except OSError as e:
+            print(f"⚠️  Gagal menghapus blob {blob['path']}: {e}")
+
+
+def link_for_job(blob_path, temp_dir):
+    """File input milik satu job (hard link ke blob CAS, fallback salinan)"""
+    os.makedirs(temp_dir, exist_ok=True)
+    ext = os.path.splitext(blob_path)[1]
+    job_path = os.path.join(temp_dir, f"{uuid.uuid4()}{ext}")
+    try:
+        os.link(blob_path, job_path)
+    except OSError:
+        shutil.copyfile(blob_path, job_path)
+    return job_path
+
+
+def prune_cas(grace_seconds=PRUNE_GRACE_SECONDS):
+    """
+    Hapus blob CAS yang tidak di-link job mana pun (st_nlink == 1) dan
+    sisa upload yang gagal. Returns: jumlah file yang dihapus
+    """
+    root = cas_root()
+    if not os.path.isdir(root):
+        return 0
+
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime < cutoff and (stat.st_nlink <= 1 or filename.startswith('.upload-')):
+                    os.remove(path)
+                    removed += 1
+            except OSError as e:
+                print(f"⚠️  Gagal membersihkan blob {path}: {e}")
+    return removed
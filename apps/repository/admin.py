@@ -6,9 +6,10 @@ from django.utils import timezone
 from django.conf import settings
 from apps.plagiarism.decorators import permission_required_custom, superadmin_required
 import os
-import fitz  # PyMuPDF
-import docx
+from apps.plagiarism.extraction import extract_canonical, write_artifacts
 from .models import RepositoryFile
+from .shingle_index import index_file
+from .text_store import STORE_EXTENSION
 
 @admin.register(RepositoryFile)
 class RepositoryFileAdmin(admin.ModelAdmin):
@@ -85,24 +86,21 @@ class RepositoryFileAdmin(admin.ModelAdmin):
 
             try:
                 full_path = repo_file.file.path
-                extracted_text = ""
 
-                if repo_file.filetype == 'pdf':
-                    doc = fitz.open(full_path)
-                    for page in doc:
-                        extracted_text += page.get_text()
-                elif repo_file.filetype == 'docx':
-                    doc = docx.Document(full_path)
-                    extracted_text = '\n'.join([p.text for p in doc.paragraphs])
+                # Ekstraksi + normalisasi yang sama persis dengan pemeriksaan plagiasi
+                extracted_text, page_starts = extract_canonical(full_path, f".{repo_file.filetype}")
 
-                extracted_text = ''.join([i for i in extracted_text if ord(i) < 128])
-
-                txt_filename = f"{repo_file.id}.content.txt"
+                txt_filename = f"{repo_file.id}{STORE_EXTENSION}"
                 txt_path = os.path.join(settings.MEDIA_ROOT, 'extracted', txt_filename)
                 os.makedirs(os.path.dirname(txt_path), exist_ok=True)
                 
-                with open(txt_path, "w", encoding="utf-8") as f:
-                    f.write(extracted_text)
+                spans = write_artifacts(txt_path, extracted_text, page_starts)
+                index_file(repo_file, extracted_text, spans)
+
+                # Hapus file teks lama (format tidak terkompresi) jika ada
+                legacy_path = os.path.join(settings.MEDIA_ROOT, 'extracted', f"{repo_file.id}.content.txt")
+                if os.path.exists(legacy_path):
+                    os.remove(legacy_path)
 
                 repo_file.extracted_text_path = txt_path
                 repo_file.extracted_text_length = len(extracted_text)
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.plagiarism.document import Document
+from apps.repository.models import RepositoryFile
+from apps.repository.shingle_index import index_file
+
+
+class Command(BaseCommand):
+    help = 'Isi index shingle kalimat dari text store file repository yang sudah diindeks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Bangun ulang semua file (default: hanya file yang belum punya index shingle)'
+        )
+
+    def handle(self, *args, **options):
+        files = RepositoryFile.objects.filter(status='indexed')
+        if not options['all']:
+            files = files.filter(shingles__isnull=True)
+
+        indexed = skipped = 0
+        for repo_file in files.distinct().iterator():
+            store = repo_file.open_text_store()
+            if store is None:
+                # Format lama (.content.txt) tanpa kalimat tersimpan: index ulang dari admin
+                self.stdout.write(self.style.WARNING(f'⚠️  Lewati {repo_file.filename}: belum ada text store'))
+                skipped += 1
+                continue
+            with store:
+                document = Document.from_text_store(store)
+            rows = index_file(repo_file, document.text, document.sentence_spans)
+            # index_date berubah -> result_cache.index_version berubah, hasil cache lama tidak dipakai
+            RepositoryFile.objects.filter(id=repo_file.id).update(index_date=timezone.now())
+            self.stdout.write(f'  {repo_file.filename}: {rows} shingle')
+            indexed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'✓ {indexed} file diindeks, {skipped} dilewati'))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repository', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RepositoryShingle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sentence', models.IntegerField(help_text='Index kalimat di text store')),
+                ('shingle', models.BigIntegerField(help_text='Hash 64-bit shingle (signed)')),
+                ('file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shingles', to='repository.repositoryfile')),
+            ],
+            options={
+                'db_table': 'repository_shingles',
+                'indexes': [models.Index(fields=['shingle', 'file'], name='repo_shingle_lookup_idx')],
+            },
+        ),
+    ]
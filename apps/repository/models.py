@@ -45,5 +45,33 @@ class RepositoryFile(models.Model):
             self.filetype = os.path.splitext(self.filename)[1].replace('.', '').lower()
         super().save(*args, **kwargs)
 
+    def open_text_store(self):
+        """
+        Buka text store terkompresi hasil indexing.
+        Returns None untuk file yang belum diindeks atau masih format lama (.content.txt).
+        """
+        from .text_store import TextStore, STORE_EXTENSION
+        path = self.extracted_text_path
+        if not path or not path.endswith(STORE_EXTENSION) or not os.path.exists(path):
+            return None
+        return TextStore(path)
+
+    class Meta:
+        db_table = 'repository_files'
+
+
+class RepositoryShingle(models.Model):
+    """
+    Posting shingle kalimat repository (apps.repository.shingle_index):
+    satu baris per (file, kalimat, hash shingle 5 kata).
+    Diisi saat indexing; dipakai pemeriksaan lokal.
+    """
+    file = models.ForeignKey(RepositoryFile, on_delete=models.CASCADE, related_name='shingles')
+    sentence = models.IntegerField(help_text="Index kalimat di text store")
+    shingle = models.BigIntegerField(help_text="Hash 64-bit shingle (signed)")
+
     class Meta:
-        db_table = 'repository_files'
\ No newline at end of file
+        db_table = 'repository_shingles'
+        indexes = [
+            models.Index(fields=['shingle', 'file'], name='repo_shingle_lookup_idx'),
+        ]
@@ -0,0 +1,108 @@
+"""
+Index shingle kalimat repository untuk pemeriksaan lokal.
+
+Saat indexing, setiap kalimat dokumen repository dipecah menjadi hash
+shingle 5 kata (``extraction.sentence_shingles``, sama dengan deteksi
+kolusi batch) dan disimpan sebagai ``RepositoryShingle``. Pemeriksaan lokal
+cukup mencari hash shingle kalimat yang diperiksa di tabel ini:
+
+- skor = persentase shingle kalimat yang ditemukan di satu file repository
+- excerpt laporan = kalimat repository dengan shingle bersama terbanyak,
+  dibaca dari text store hasil indexing (hanya blok yang dibutuhkan)
+
+File yang diindeks sebelum index ini ada bisa diisi ulang dengan
+``python manage.py index_repository_shingles``.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+
+from apps.plagiarism.extraction import sentence_shingles
+from apps.repository.models import RepositoryFile, RepositoryShingle
+
+BULK_SIZE = 5000
+EXCERPT_CHARS = 300
+
+
+def _signed(value):
+    """uint64 -> int64 (BigIntegerField bertanda)"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _query_hashes(sentence):
+    _, hashes = next(sentence_shingles(sentence, [(0, len(sentence))]))
+    return [_signed(value) for value in hashes]
+
+
+def index_file(repo_file, text, sentence_spans):
+    """
+    Ganti posting shingle ``repo_file`` dengan hasil dari teks kanonik.
+    Returns: jumlah baris yang ditulis.
+    """
+    rows = [
+        RepositoryShingle(file_id=repo_file.id, sentence=index, shingle=_signed(value))
+        for index, hashes in sentence_shingles(text, sentence_spans)
+        for value in hashes
+    ]
+    with transaction.atomic():
+        RepositoryShingle.objects.filter(file_id=repo_file.id).delete()
+        RepositoryShingle.objects.bulk_create(rows, batch_size=BULK_SIZE)
+    return len(rows)
+
+
+def best_match(sentence):
+    """
+    File repository (status indexed) dengan shingle bersama terbanyak.
+    Returns: (skor 0-100, file_id) atau None jika tidak ada kecocokan.
+    """
+    hashes = _query_hashes(sentence)
+    if not hashes:
+        return None
+    row = (
+        RepositoryShingle.objects
+        .filter(shingle__in=hashes, file__status='indexed')
+        .values('file_id')
+        .annotate(shared=Count('shingle', distinct=True))
+        .order_by('-shared')
+        .first()
+    )
+    if row is None:
+        return None
+    return row['shared'] / len(hashes) * 100, row['file_id']
+
+
+def attach_excerpts(results):
+    """
+    Tambahkan ``metadata['excerpt']`` (kalimat repository yang paling cocok)
+    ke hasil pemeriksaan lokal. Satu query posting per file sumber; teks
+    dibaca dari text store, file tanpa text store dilewati.
+    """
+    by_file = defaultdict(list)
+    for result in results:
+        repo_id = result.get('metadata', {}).get('repo_id')
+        if repo_id:
+            by_file[repo_id].append((result, set(_query_hashes(result['sentence']))))
+
+    for repo_file in RepositoryFile.objects.filter(id__in=list(by_file)):
+        store = repo_file.open_text_store()
+        if store is None:
+            continue
+        matches = by_file[repo_file.id]
+        wanted = set().union(*(hashes for _, hashes in matches))
+        postings = defaultdict(set)
+        for sentence, shingle in (
+            RepositoryShingle.objects
+            .filter(file_id=repo_file.id, shingle__in=list(wanted))
+            .values_list('sentence', 'shingle')
+        ):
+            postings[sentence].add(shingle)
+
+        with store:
+            for result, hashes in matches:
+                shared = {sentence: len(found & hashes) for sentence, found in postings.items()}
+                if not shared:
+                    continue
+                index = max(shared, key=lambda sentence: (shared[sentence], -sentence))
+                if shared[index] and index < store.sentence_count:
+                    result['metadata']['excerpt'] = store.sentence(index)[:EXCERPT_CHARS]
@@ -1,3 +1,49 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from apps.repository.text_store import TextStore, locate_spans, write_text_store
+
+
+class TextStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = os.path.join(self.tmp, 'dokumen.store')
+
+    def test_round_trip_across_blocks(self):
+        sentences = [f"Kalimat ke-{i} tentang sistem informasi perpustakaan é€." for i in range(200)]
+        text = ' '.join(sentences)
+        spans = locate_spans(text, sentences)
+        # Blok kecil: kalimat dan rentang baca melintasi batas blok
+        write_text_store(self.path, text, spans, page_starts=[0, 5000], block_chars=257)
+
+        with TextStore(self.path) as store:
+            self.assertEqual(store.read_all(), text)
+            self.assertEqual(store.read(250, 1300), text[250:1300])
+            self.assertEqual(store.read(len(text) - 3, len(text) + 50), text[-3:])
+            self.assertEqual(store.read(10, 10), '')
+            self.assertEqual(store.sentence_count, len(sentences))
+            for index in (0, 57, 199):
+                self.assertEqual(store.sentence(index), sentences[index])
+            self.assertEqual(list(store.section('pages')), [0, 5000])
+
+    def test_empty_text(self):
+        write_text_store(self.path, '')
+
+        with TextStore(self.path) as store:
+            self.assertEqual(store.read_all(), '')
+            self.assertEqual(store.sentence_count, 0)
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'bukan text store' * 10)
+
+        with self.assertRaises(ValueError):
+            TextStore(self.path)
+
+    def test_locate_spans_skips_missing_sentences(self):
+        text = "Satu. Dua. Tiga."
+        self.assertEqual(locate_spans(text, ["Satu.", "Empat.", "Tiga."]), [(0, 5), (11, 16)])
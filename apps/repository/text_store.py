@@ -0,0 +1,227 @@
+"""
+Penyimpanan teks hasil ekstraksi dalam format terkompresi dengan tabel offset.
+
+Layout file (``*.content.ztx``)::
+
+    MAGIC
+    [blok 0][blok 1]...[blok n-1]     teks UTF-8, tiap blok dikompres zlib
+    [index]                           zlib(header JSON + array offset)
+    footer                            <offset index><panjang index>MAGIC
+
+Setiap blok menyimpan ``BLOCK_CHARS`` karakter, sehingga pembaca cukup
+mendekompresi blok yang beririsan dengan rentang karakter yang dibutuhkan
+(satu kalimat untuk excerpt laporan).
+
+Index menyimpan beberapa *section* berupa array integer:
+- ``blocks``    : (offset file, panjang terkompres, karakter awal, jumlah karakter) per blok
+- ``sentences`` : (karakter awal, karakter akhir) per kalimat
+- ``pages``     : karakter awal setiap halaman
+
+Modul ini tidak bergantung pada Django.
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+MAGIC = b'SISTXT1\x00'
+FOOTER = struct.Struct('<QQ8s')
+HEADER_LEN = struct.Struct('<I')
+
+BLOCK_CHARS = 16 * 1024
+COMPRESS_LEVEL = 6
+STORE_EXTENSION = '.content.ztx'
+
+_BLOCK_FIELDS = 4
+_CACHED_BLOCKS = 4
+
+
+def _to_le_bytes(values):
+    arr = array('Q', values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le_bytes(data):
+    arr = array('Q')
+    arr.frombytes(data)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+
+def locate_spans(text, sentences):
+    """
+    Cari (awal, akhir) setiap kalimat di ``text`` secara berurutan.
+    Kalimat yang tidak ditemukan (misal sudah diubah tokenizer) dilewati.
+    """
+    spans = []
+    cursor = 0
+    for sentence in sentences:
+        start = text.find(sentence, cursor)
+        if start < 0:
+            continue
+        end = start + len(sentence)
+        spans.append((start, end))
+        cursor = end
+    return spans
+
+
+def write_text_store(path, text, sentence_spans=(), page_starts=(), block_chars=BLOCK_CHARS):
+    """
+    Tulis ``text`` ke ``path`` sebagai text store terkompresi.
+
+    File ditulis ke ``path + '.tmp'`` lalu di-rename, sehingga pembaca
+    tidak pernah melihat file setengah jadi.
+    Returns: jumlah byte file yang ditulis.
+    """
+    tmp_path = f"{path}.tmp"
+    blocks = []
+
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        offset = len(MAGIC)
+
+        for char_start in range(0, len(text), block_chars):
+            chunk = text[char_start:char_start + block_chars]
+            data = zlib.compress(chunk.encode('utf-8'), COMPRESS_LEVEL)
+            f.write(data)
+            blocks.extend((offset, len(data), char_start, len(chunk)))
+            offset += len(data)
+
+        sections = [
+            ('blocks', blocks),
+            ('sentences', [pos for span in sentence_spans for pos in span]),
+            ('pages', list(page_starts)),
+        ]
+
+        header = json.dumps({
+            'length': len(text),
+            'block_chars': block_chars,
+            'sections': [[name, len(values)] for name, values in sections],
+        }).encode('utf-8')
+        payload = HEADER_LEN.pack(len(header)) + header + b''.join(
+            _to_le_bytes(values) for _, values in sections
+        )
+        index = zlib.compress(payload, COMPRESS_LEVEL)
+        f.write(index)
+        f.write(FOOTER.pack(offset, len(index), MAGIC))
+        size = f.tell()
+
+    os.replace(tmp_path, path)
+    return size
+
+
+class TextStore:
+    """
+    Pembaca text store. Index dimuat saat dibuka; blok teks hanya
+    didekompresi ketika rentangnya dibaca (dengan cache kecil beberapa blok).
+
+    Usage:
+        with TextStore(path) as store:
+            start, end = store.sentence_span(10)
+            excerpt = store.read(start, end)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._block_cache = {}
+        try:
+            self._load_index()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _load_index(self):
+        f = self._file
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size < len(MAGIC) + FOOTER.size:
+            raise ValueError(f"Text store terlalu kecil: {self.path}")
+
+        f.seek(size - FOOTER.size)
+        index_offset, index_len, magic = FOOTER.unpack(f.read(FOOTER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Bukan file text store: {self.path}")
+
+        f.seek(index_offset)
+        payload = zlib.decompress(f.read(index_len))
+        (header_len,) = HEADER_LEN.unpack_from(payload)
+        pos = HEADER_LEN.size
+        header = json.loads(payload[pos:pos + header_len])
+        pos += header_len
+
+        self.length = header['length']
+        self.block_chars = header['block_chars']
+        self._sections = {}
+        for name, count in header['sections']:
+            nbytes = count * 8
+            self._sections[name] = _from_le_bytes(payload[pos:pos + nbytes])
+            pos += nbytes
+
+    # --- Lifecycle ---
+
+    def close(self):
+        self._file.close()
+        self._block_cache.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Section access ---
+
+    def section(self, name):
+        """Array integer mentah dari section ``name`` (kosong jika tidak ada)"""
+        return self._sections.get(name, array('Q'))
+
+    @property
+    def sentence_count(self):
+        return len(self.section('sentences')) // 2
+
+    # --- Text access ---
+
+    def _block(self, index):
+        text = self._block_cache.get(index)
+        if text is None:
+            blocks = self.section('blocks')
+            base = index * _BLOCK_FIELDS
+            offset, comp_len = blocks[base], blocks[base + 1]
+            self._file.seek(offset)
+            text = zlib.decompress(self._file.read(comp_len)).decode('utf-8')
+            if len(self._block_cache) >= _CACHED_BLOCKS:
+                self._block_cache.pop(next(iter(self._block_cache)))
+            self._block_cache[index] = text
+        return text
+
+    def read(self, start=0, end=None):
+        """Baca karakter [start, end) dengan hanya mendekompresi blok terkait"""
+        end = self.length if end is None else min(end, self.length)
+        start = max(0, start)
+        if start >= end:
+            return ""
+
+        first = start // self.block_chars
+        last = (end - 1) // self.block_chars
+        parts = []
+        for index in range(first, last + 1):
+            block_start = index * self.block_chars
+            block = self._block(index)
+            parts.append(block[max(start - block_start, 0):end - block_start])
+        return ''.join(parts)
+
+    def read_all(self):
+        return self.read(0, self.length)
+
+    def sentence_span(self, index):
+        sentences = self.section('sentences')
+        return sentences[index * 2], sentences[index * 2 + 1]
+
+    def sentence(self, index):
+        return self.read(*self.sentence_span(index))
@@ -0,0 +1,142 @@
+"""
+Benchmark perbandingan antar dokumen batch (apps.plagiarism.collusion).
+
+Membuat N dokumen sintetis (default 300, ~400 kalimat) yang semuanya memuat
+teks soal/template yang sama, lalu menanam pasangan salinan:
+- salinan berat  : B menyalin 60% kalimat A
+- salinan sebagian: B menyalin 25% kalimat A
+
+Mengukur:
+- Waktu shingling per dokumen (dikerjakan worker saat item diproses)
+- Waktu ``find_suspicious_pairs`` (inverted index) untuk seluruh batch
+- Recall pasangan yang ditanam dan jumlah false positive
+- Opsional (--naive): perbandingan set O(n²) sebagai pembanding
+
+Jalankan dari root project:
+    python benchmarks/bench_collusion.py [--docs 300] [--sentences 400] [--naive]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def setup_django(settings_module):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def make_vocabulary(rng, size=6000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def make_sentence(rng, vocabulary):
+    # Distribusi Zipf-ish: kata umum lebih sering muncul
+    words = [vocabulary[int(rng.paretovariate(1.1)) % len(vocabulary)] for _ in range(rng.randint(10, 22))]
+    return ' '.join(words).capitalize() + '.'
+
+
+def make_batch(docs, sentences, seed):
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    template = [make_sentence(rng, vocabulary) for _ in range(15)]
+    corpus = [template + [make_sentence(rng, vocabulary) for _ in range(sentences)] for _ in range(docs)]
+
+    planted = {}
+    order = list(range(docs))
+    rng.shuffle(order)
+    for kind, share, count in (('berat', 0.6, docs // 20), ('sebagian', 0.25, docs // 30)):
+        for _ in range(count):
+            a, b = order.pop(), order.pop()
+            own = corpus[a][len(template):]
+            copied = rng.sample(own, int(len(own) * share))
+            corpus[b][len(template):len(template) + len(copied)] = copied
+            planted[(min(a, b), max(a, b))] = kind
+    return [' '.join(doc) for doc in corpus], planted
+
+
+def naive_pairs(fingerprints, max_df, min_jaccard, min_containment):
+    """Pembanding O(n²): irisan set per pasangan (dengan filter df yang sama)"""
+    from collections import Counter
+
+    df = Counter()
+    for shingles in fingerprints.values():
+        df.update(shingles)
+    cap = max(2, int(max_df * len(fingerprints)))
+    sets = {key: {s for s in shingles if df[s] <= cap} for key, shingles in fingerprints.items()}
+
+    keys = list(sets)
+    found = set()
+    for i, a in enumerate(keys):
+        for b in keys[i + 1:]:
+            common = len(sets[a] & sets[b])
+            if not common:
+                continue
+            union = len(sets[a]) + len(sets[b]) - common
+            smaller = min(len(sets[a]), len(sets[b]))
+            if common / union >= min_jaccard or common / smaller >= min_containment:
+                found.add((a, b))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--settings', default=os.environ.get('DJANGO_SETTINGS_MODULE', 'sisindo_core.settings'))
+    parser.add_argument('--docs', type=int, default=300)
+    parser.add_argument('--sentences', type=int, default=400)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--naive', action='store_true', help='jalankan juga perbandingan O(n²)')
+    args = parser.parse_args()
+
+    setup_django(args.settings)
+    from django.conf import settings
+
+    from apps.plagiarism.collusion import find_suspicious_pairs
+    from apps.plagiarism.extraction import shingle_hashes, split_sentences
+
+    print(f"Membuat {args.docs} dokumen x {args.sentences} kalimat...")
+    texts, planted = make_batch(args.docs, args.sentences, args.seed)
+
+    start = time.perf_counter()
+    fingerprints = {}
+    for idx, text in enumerate(texts):
+        fingerprints[idx] = shingle_hashes(text, split_sentences(text))
+    shingle_time = time.perf_counter() - start
+    total_shingles = sum(len(f) for f in fingerprints.values())
+    print(f"Shingling      : {shingle_time:.2f}s total, {shingle_time / len(texts) * 1000:.1f} ms/dokumen "
+          f"({total_shingles / len(texts):.0f} shingle/dokumen)")
+
+    start = time.perf_counter()
+    pairs = find_suspicious_pairs(fingerprints)
+    index_time = time.perf_counter() - start
+    print(f"Inverted index : {index_time:.2f}s untuk {args.docs * (args.docs - 1) // 2} pasangan kandidat")
+
+    found = {(p['a'], p['b']) for p in pairs}
+    for kind in ('berat', 'sebagian'):
+        expected = {pair for pair, k in planted.items() if k == kind}
+        print(f"Recall {kind:<8}: {len(expected & found)}/{len(expected)}")
+    print(f"False positive : {len(found - set(planted))}")
+    for pair in pairs[:5]:
+        print(f"   {pair['a']:>4} - {pair['b']:<4} jaccard {pair['jaccard']:>5}%  "
+              f"containment {pair['containment']:>5}%  shared {pair['shared']}")
+
+    if args.naive:
+        start = time.perf_counter()
+        naive = naive_pairs(
+            fingerprints,
+            settings.PLAGIARISM_COLLUSION_MAX_DF,
+            settings.PLAGIARISM_COLLUSION_MIN_JACCARD,
+            settings.PLAGIARISM_COLLUSION_MIN_CONTAINMENT,
+        )
+        naive_time = time.perf_counter() - start
+        print(f"Naive O(n²)    : {naive_time:.2f}s (hasil sama: {naive == found})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Regression check waktu import saat startup Django (``python -X importtime``).
+
+Meng-import modul admin seperti saat web worker / ``manage.py`` start,
+lalu memastikan library berat (PyMuPDF, python-docx, NLTK, googlesearch,
+ReportLab) TIDAK ikut ter-import — library tersebut hanya boleh dimuat
+secara lazy saat benar-benar dipakai oleh service/extractor.
+
+Jalankan dari root project:
+    python benchmarks/bench_import_time.py [--settings sisindo_core.settings] [--budget-ms 0]
+
+Exit code 1 jika ada modul berat yang ter-import atau waktu import
+kumulatif melebihi ``--budget-ms`` (0 = tanpa batas waktu).
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level package yang tidak boleh dimuat saat startup
+HEAVY_PACKAGES = ('fitz', 'pymupdf', 'docx', 'nltk', 'googlesearch', 'reportlab')
+
+STARTUP_SNIPPET = (
+    "import django; django.setup(); "
+    "import apps.plagiarism.admin, apps.repository.admin, apps.history.admin"
+)
+
+
+def run_importtime(settings_module):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SNIPPET],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        sys.exit(proc.returncode)
+    return proc.stderr
+
+
+def parse(stderr):
+    """Returns: list (self_us, cumulative_us, module) dari output -X importtime"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        fields = line.split(':', 1)[1].split('|')
+        try:
+            rows.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+        except (ValueError, IndexError):
+            continue
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--settings', default=os.environ.get('DJANGO_SETTINGS_MODULE', 'sisindo_core.settings'))
+    parser.add_argument('--budget-ms', type=float, default=0)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    rows = parse(run_importtime(args.settings))
+    total_ms = sum(self_us for self_us, _, _ in rows) / 1000
+
+    print(f"Total waktu import startup: {total_ms:.1f} ms ({len(rows)} modul)\n")
+    print(f"Top {args.top} kumulatif:")
+    for _, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    heavy = sorted({
+        name for _, _, name in rows
+        if name.split('.')[0] in HEAVY_PACKAGES
+    })
+    failed = False
+    if heavy:
+        failed = True
+        print("\n❌ Modul berat ter-import saat startup:")
+        for name in heavy[:20]:
+            print(f"   - {name}")
+    else:
+        print(f"\n✅ Tidak ada modul berat ({', '.join(HEAVY_PACKAGES)}) saat startup")
+
+    if args.budget_ms and total_ms > args.budget_ms:
+        failed = True
+        print(f"❌ Melebihi budget {args.budget_ms:.0f} ms")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
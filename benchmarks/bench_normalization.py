@@ -0,0 +1,127 @@
+"""
+Micro-benchmark normalisasi teks: implementasi lama (loop per karakter)
+vs apps.plagiarism.normalization (tabel str.translate + regex terkompilasi).
+
+Jalankan dari root project:
+    python benchmarks/bench_normalization.py [--size-mb 1] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.plagiarism.normalization import normalize_text  # noqa: E402
+
+
+# --- Implementasi lama (disalin dari PlagiarismService sebelum refactor) ---
+
+def legacy_clean_text_for_mariadb(text):
+    if not text:
+        return ""
+    text = text.encode('utf-8', 'ignore').decode('utf-8')
+    text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\t')
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    return '\n'.join(lines)
+
+
+def legacy_clean_text(text):
+    if not text:
+        return ""
+    allowed_chars = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,!?;:\n\r\t()-"\'/')
+    cleaned = []
+    for char in text:
+        if char in allowed_chars or ord(char) > 127:
+            cleaned.append(char)
+        else:
+            cleaned.append(' ')
+    text = ''.join(cleaned)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line:
+            lines.append(line)
+    text = '\n'.join(lines)
+    return text.strip()
+
+
+def legacy_tokenize_cleaning(text, split_sentences):
+    """Pola lama di tokenize(): bersihkan dokumen, lalu bersihkan lagi per kalimat"""
+    text = legacy_clean_text_for_mariadb(text)
+    return [legacy_clean_text_for_mariadb(s) for s in split_sentences(text)]
+
+
+# --- Data uji ---
+
+WORDS = (
+    "penelitian ini bertujuan untuk menganalisis sistem informasi akademik "
+    "berbasis web pada universitas dengan metode waterfall dan pengujian "
+    "black box sehingga diperoleh hasil yang sesuai kebutuhan pengguna"
+).split()
+NOISE = ['\x0c', '\x00', '\r', '\t', '  ', ' ', '#', '@', '*', 'é', '—']
+
+
+def make_text(size_bytes, seed=42):
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size_bytes:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 20)))
+        if rng.random() < 0.3:
+            sentence += rng.choice(NOISE)
+        sentence = sentence.capitalize() + '.'
+        parts.append(sentence)
+        parts.append('\n\n  \n' if rng.random() < 0.1 else (' \n' if rng.random() < 0.3 else ' '))
+        length += len(sentence) + 1
+    return ''.join(parts)
+
+
+def simple_split(text):
+    return [s + '.' for s in text.split('.') if s.strip()]
+
+
+def bench(label, func, repeat):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"  {label:<45} {best * 1000:9.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_text(int(args.size_mb * 1024 * 1024))
+    print(f"Teks uji: {len(text):,} karakter, repeat={args.repeat} (best-of)")
+
+    # Pastikan output identik sebelum membandingkan kecepatan
+    assert normalize_text(text) == legacy_clean_text_for_mariadb(text), "output mariadb berbeda"
+    assert normalize_text(text, strip_symbols=True) == legacy_clean_text(text), "output _clean_text berbeda"
+    print("  ✓ Output identik dengan implementasi lama\n")
+
+    print("_clean_text_for_mariadb:")
+    old = bench("legacy (generator per karakter)", lambda: legacy_clean_text_for_mariadb(text), args.repeat)
+    new = bench("normalize_text", lambda: normalize_text(text), args.repeat)
+    print(f"  speedup: {old / new:.1f}x\n")
+
+    print("_clean_text:")
+    old = bench("legacy (loop per karakter)", lambda: legacy_clean_text(text), args.repeat)
+    new = bench("normalize_text(strip_symbols=True)", lambda: normalize_text(text, strip_symbols=True), args.repeat)
+    print(f"  speedup: {old / new:.1f}x\n")
+
+    print("tokenize() cleaning (dokumen + per kalimat):")
+    old = bench("legacy (2x clean)", lambda: legacy_tokenize_cleaning(text, simple_split), args.repeat)
+    new = bench("normalize sekali", lambda: simple_split(normalize_text(text)), args.repeat)
+    print(f"  speedup: {old / new:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
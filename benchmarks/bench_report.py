@@ -0,0 +1,175 @@
+"""
+Benchmark rendering laporan PDF (apps.plagiarism.pdf_report).
+
+Membuat hasil pemeriksaan sintetis dengan N kalimat terdeteksi (default
+2.000, campuran sumber lokal dan internet), lalu mengukur (median dari
+--repeat kali):
+- Satu tabel detail raksasa dengan Paragraph biasa (cara lama)
+- Tabel dipecah per DETAIL_CHUNK_ROWS baris, Paragraph biasa
+- Tabel dipecah + CellParagraph (wrap sel dipakai ulang, cara sekarang)
+- Biaya membangun ulang style per laporan (cara lama) yang kini dibangun
+  sekali di level modul
+- Opsional (--reports M): M laporan dirender berurutan di proses ini vs
+  lewat render pool (``reporting.render_pdf``, PLAGIARISM_REPORT_WORKERS).
+  Render pool memindahkan CPU render keluar dari proses web; total waktu
+  hanya turun jika server punya CPU lebih dari satu.
+
+Contoh (2.000 kalimat, 1 CPU, ReportLab 5.0 tanpa rl_accel): satu tabel
+2.69s, tabel dipecah 2.11s, + CellParagraph 1.38s.
+
+Jalankan dari root project:
+    python benchmarks/bench_report.py [--hits 2000] [--repeat 5] [--reports 4]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def setup_django(settings_module):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def make_results(hits, seed):
+    rng = random.Random(seed)
+    words = ['sistem', 'informasi', 'basis', 'data', 'jaringan', 'metode', 'analisis', 'penelitian',
+             'algoritma', 'pengujian', 'aplikasi', 'pengguna', 'model', 'hasil', 'proses', 'evaluasi']
+    local_sources = [
+        {'title': f"Skripsi {i} tentang {' '.join(rng.sample(words, 3))}",
+         'author': f"Penulis {i}", 'year': 2015 + i % 10, 'count': 0}
+        for i in range(40)
+    ]
+    results = []
+    for i in range(hits):
+        sentence = ' '.join(rng.choice(words) for _ in range(rng.randint(12, 30))).capitalize() + '.'
+        if rng.random() < 0.6:
+            source = rng.choice(local_sources)
+            source['count'] += 1
+            results.append({'sentence': sentence, 'source': 'Lokal', 'score': rng.uniform(75, 100),
+                            'metadata': {'title': source['title'], 'author': source['author'], 'year': source['year']}})
+        else:
+            results.append({'sentence': sentence, 'source': 'Internet', 'score': rng.uniform(75, 100),
+                            'metadata': {'url': f"https://contoh-{i % 300}.ac.id/jurnal/{i}/artikel-penelitian"}})
+    return {
+        'results': results,
+        'similarity_global': 40.0,
+        'similarity_local': 25.0,
+        'similarity_internet': 15.0,
+        'local_sources': [s for s in local_sources if s['count']],
+        'internet_sources': sorted({r['metadata']['url'] for r in results if 'url' in r['metadata']})[:200],
+    }
+
+
+def legacy_styles():
+    """Style yang dulu dibangun ulang di setiap generate_pdf_report"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.platypus import TableStyle
+
+    styles = getSampleStyleSheet()
+    for name, parent in (('T', 'Heading1'), ('H', 'Heading2'), ('S', 'Heading3'), ('N', 'Normal')):
+        ParagraphStyle(name, parent=styles[parent], fontSize=10)
+    for _ in range(3):
+        TableStyle([('GRID', (0, 0), (-1, -1), 1, colors.black), ('VALIGN', (0, 0), (-1, -1), 'TOP')])
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+@contextmanager
+def plain_cells(pdf_report):
+    """Sel tabel memakai Paragraph biasa (wrap ulang setiap kali), seperti dulu"""
+    from reportlab.platypus import Paragraph
+
+    cell = pdf_report.CellParagraph
+    pdf_report.CellParagraph = Paragraph
+    try:
+        yield
+    finally:
+        pdf_report.CellParagraph = cell
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--settings', default=os.environ.get('DJANGO_SETTINGS_MODULE', 'sisindo_core.settings'))
+    parser.add_argument('--hits', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3, help='jumlah render per varian (diambil median)')
+    parser.add_argument('--reports', type=int, default=0, help='render M laporan: berurutan vs render pool')
+    args = parser.parse_args()
+
+    from apps.plagiarism import pdf_report
+
+    check_results = make_results(args.hits, args.seed)
+    print(f"Laporan sintetis: {args.hits} kalimat terdeteksi, "
+          f"{len(check_results['local_sources'])} sumber lokal, {len(check_results['internet_sources'])} URL")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def render(name, **kwargs):
+            path = os.path.join(tmp, name)
+            elapsed = statistics.median(
+                timed(pdf_report.build_report, path, 'bench.docx', check_results, 75,
+                      sentence_count=args.hits * 2, **kwargs)
+                for _ in range(args.repeat)
+            )
+            return elapsed, os.path.getsize(path)
+
+        render('warmup.pdf')  # font / modul ReportLab termuat
+
+        with plain_cells(pdf_report):
+            single, single_size = render('single.pdf', chunk_rows=0)
+            chunked, _ = render('chunked_plain.pdf')
+        current, current_size = render('chunked.pdf')
+        print(f"Satu tabel, Paragraph biasa    : {single:.2f}s ({single_size / 1024:.0f} KB)")
+        print(f"Tabel dipecah, Paragraph biasa : {chunked:.2f}s "
+              f"({pdf_report.DETAIL_CHUNK_ROWS} baris/tabel, {single / chunked:.2f}x)")
+        print(f"Tabel dipecah + CellParagraph  : {current:.2f}s "
+              f"({current_size / 1024:.0f} KB, {single / current:.2f}x dari cara lama)")
+
+        style_time = timed(lambda: [legacy_styles() for _ in range(100)]) / 100
+        print(f"Style per laporan (lama): {style_time * 1000:.2f} ms (sekarang: sekali per proses)")
+
+        if args.reports:
+            setup_django(args.settings)
+            from django.conf import settings
+
+            from apps.plagiarism.reporting import get_render_pool, render_pdf
+
+            paths = [os.path.join(tmp, f"seq_{i}.pdf") for i in range(args.reports)]
+            sequential = timed(lambda: [pdf_report.build_report(p, 'bench.docx', check_results, 75) for p in paths])
+            print(f"{args.reports} laporan berurutan : {sequential:.2f}s")
+
+            pool = get_render_pool()
+            if pool is None:
+                print("Render pool nonaktif (PLAGIARISM_REPORT_WORKERS = 0)")
+                return
+            render_pdf(os.path.join(tmp, 'pool_warmup.pdf'), 'bench.docx', check_results, 75)
+            futures = []
+
+            def submit_all():
+                for i in range(args.reports):
+                    path = os.path.join(tmp, f"pool_{i}.pdf")
+                    futures.append(pool.submit(pdf_report.build_report, path, 'bench.docx', check_results, 75))
+                for future in futures:
+                    future.result()
+
+            pooled = timed(submit_all)
+            print(f"{args.reports} laporan render pool: {pooled:.2f}s "
+                  f"({settings.PLAGIARISM_REPORT_WORKERS} proses, {os.cpu_count()} CPU)")
+            pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
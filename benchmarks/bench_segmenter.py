@@ -0,0 +1,115 @@
+"""
+Benchmark segmentasi kalimat: rule-based Indonesia (apps.plagiarism.segmenter)
+vs NLTK punkt (``sent_tokenize``).
+
+Mengukur:
+- Akurasi batas kalimat (precision/recall/F1) pada sampel berlabel
+- Throughput (MB/s) pada teks ~1 MB
+
+Jalankan dari root project:
+    python benchmarks/bench_segmenter.py [--size-mb 1] [--repeat 3]
+
+Punkt membutuhkan data NLTK (python setup_nltk.py); jika tidak tersedia,
+baris punkt dilewati.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.plagiarism.segmenter import split_sentences  # noqa: E402
+
+# Sampel berlabel: setiap elemen adalah satu kalimat utuh (gold standard)
+GOLD_SENTENCES = [
+    "Penelitian ini dibimbing oleh Dr. Ahmad Fauzi, S.Kom., M.Kom. dari Program Studi Sistem Informasi.",
+    "Data dikumpulkan melalui wawancara, observasi, studi pustaka, dll.",
+    "Selanjutnya data dianalisis menggunakan metode kualitatif.",
+    "Menurut Sugiyono dkk. (2019) populasi adalah wilayah generalisasi yang terdiri atas objek atau subjek.",
+    "Sistem dikembangkan dengan PHP, MySQL, JavaScript, dsb. dan diuji dengan metode black box.",
+    "Apakah sistem yang dibangun sudah sesuai dengan kebutuhan pengguna?",
+    "Hasil pengujian menunjukkan tingkat akurasi sebesar 92.5% pada data uji.",
+    "Kantor tersebut beralamat di Jl. Merdeka No. 10 Kec. Sukajadi, Kab. Bandung.",
+    "Prof. Ir. Budi Santoso, M.T., Ph.D. menyatakan bahwa metode tersebut efektif.",
+    "Wawancara dilakukan dengan Bpk. Hendra selaku kepala bagian akademik.",
+    "Pengujian dilakukan s.d. tanggal 20 Agustus 2023.",
+    "Hasilnya sangat memuaskan!",
+    "Penulis A. Rahman menjelaskan konsep tersebut secara rinci pada Gbr. 3 dan Tab. 2.",
+    "Tahapan waterfall meliputi analisis, desain, implementasi, pengujian, dst.",
+    "Kemudian sistem diimplementasikan di lingkungan produksi.",
+    "Skripsi ini disusun untuk memenuhi syarat memperoleh gelar S.Kom. di Universitas Sisindo.",
+    "Lihat juga Hal. 45 pada buku tersebut untuk penjelasan lebih lanjut.",
+    "Responden terdiri dari mahasiswa, dosen, staf, dll. yang aktif pada semester genap.",
+    "Nilai rata-rata yang diperoleh adalah 85 dari skala 100.",
+    "Penelitian sebelumnya oleh Putri et al. juga menggunakan pendekatan yang serupa.",
+]
+
+
+def gold_boundaries(sentences):
+    """Offset akhir setiap kalimat dalam teks gabungan"""
+    text = ' '.join(sentences)
+    ends, pos = set(), 0
+    for s in sentences:
+        pos += len(s)
+        ends.add(pos)
+        pos += 1
+    return text, ends
+
+
+def predicted_boundaries(text, sentences):
+    ends, cursor = set(), 0
+    for s in sentences:
+        start = text.find(s.strip(), cursor)
+        if start < 0:
+            continue
+        cursor = start + len(s.strip())
+        ends.add(cursor)
+    return ends
+
+
+def score(gold, predicted):
+    tp = len(gold & predicted)
+    precision = tp / len(predicted) if predicted else 0.0
+    recall = tp / len(gold) if gold else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def load_punkt():
+    try:
+        from nltk.tokenize import sent_tokenize
+        sent_tokenize("Tes. Tes.")
+        return sent_tokenize
+    except Exception as e:
+        print(f"  (punkt dilewati: {type(e).__name__})")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    segmenters = [('regex (Indonesia)', split_sentences)]
+    punkt = load_punkt()
+    if punkt:
+        segmenters.append(('nltk punkt', punkt))
+
+    text, gold = gold_boundaries(GOLD_SENTENCES)
+    print(f"Akurasi batas kalimat ({len(GOLD_SENTENCES)} kalimat berlabel):")
+    for label, func in segmenters:
+        p, r, f1 = score(gold, predicted_boundaries(text, func(text)))
+        print(f"  {label:<20} precision={p:.2f} recall={r:.2f} F1={f1:.2f}")
+
+    big = (text + '\n') * max(1, int(args.size_mb * 1024 * 1024 / (len(text) + 1)))
+    mb = len(big.encode('utf-8')) / (1024 * 1024)
+    print(f"\nThroughput ({mb:.2f} MB, best of {args.repeat}):")
+    for label, func in segmenters:
+        best = min(timeit.repeat(lambda: func(big), number=1, repeat=args.repeat))
+        print(f"  {label:<20} {best * 1000:8.1f} ms  ({mb / best:6.1f} MB/s)")
+
+
+if __name__ == '__main__':
+    main()
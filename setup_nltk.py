@@ -10,7 +10,11 @@ else:
     ssl._create_default_https_context = _create_unverified_https_context
 
 def download_nltk_data():
-    """Download all required NLTK data"""
+    """
+    Download all required NLTK data.
+    Hanya dibutuhkan jika PLAGIARISM_SENTENCE_SEGMENTER = 'punkt';
+    segmenter default ('regex') tidak memakai data NLTK.
+    """
     
     print("=" * 60)
     print("NLTK Data Setup for SISINDO")
@@ -113,6 +113,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'sisindo_core.wsgi.application'
+ASGI_APPLICATION = 'sisindo_core.asgi.application'  # uvicorn/daphne: view cek plagiasi async
 
 
 # Database
@@ -178,6 +179,76 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Pengaturan pemeriksaan plagiarisme
+# Segmentasi kalimat: 'regex' (rule-based Bahasa Indonesia, tanpa data NLTK)
+# atau 'punkt' (NLTK, butuh download lewat setup_nltk.py)
+PLAGIARISM_SENTENCE_SEGMENTER = 'regex'
+PLAGIARISM_SENTENCE_WORKERS = 4       # thread pemeriksa kalimat per dokumen (1 = berurutan)
+PLAGIARISM_CHECK_CHUNK_SIZE = 25      # jumlah kalimat per potongan kerja
+PLAGIARISM_RESULT_CACHE_DAYS = 7      # hasil dokumen identik dipakai ulang selama N hari (0 = nonaktif)
+
+# Antrian job (database) dan worker pool
+# 'thread'   : worker thread di dalam proses web
+# 'external' : jalankan `python manage.py run_plagiarism_worker` terpisah
+PLAGIARISM_WORKER_MODE = 'thread'
+PLAGIARISM_WORKER_AUTOSTART = True     # 'thread': pool dijalankan saat proses web start (AppConfig.ready)
+PLAGIARISM_WORKER_CONCURRENCY = 2      # jumlah worker thread per proses
+PLAGIARISM_HEARTBEAT_SECONDS = 15      # interval heartbeat job yang sedang diproses
+PLAGIARISM_HEARTBEAT_TIMEOUT = 120     # heartbeat lebih tua dari ini: job dianggap ditinggalkan worker
+PLAGIARISM_REAPER_INTERVAL = 60        # interval reaper berkala di dalam worker
+PLAGIARISM_QUEUE_POLL_SECONDS = 5      # interval cek antrian saat idle
+PLAGIARISM_JOB_MAX_ATTEMPTS = 3        # batas percobaan sebelum job ditandai gagal
+PLAGIARISM_SMALL_DOCUMENT_BYTES = 512 * 1024  # dokumen sekecil ini (dan paste text) didahulukan di antrian
+
+# Pemeriksaan batch (permission accounts.can_batch_check)
+PLAGIARISM_BATCH_MAX_FILES = 300
+PLAGIARISM_BATCH_MAX_UPLOAD_BYTES = 500 * 1024 * 1024  # total ukuran (setelah ekstrak zip)
+DATA_UPLOAD_MAX_NUMBER_FILES = 350     # default Django 100 terlalu kecil untuk multi-upload batch
+
+# Kemiripan antar dokumen dalam satu batch (apps.plagiarism.collusion)
+PLAGIARISM_COLLUSION_MIN_JACCARD = 0.1      # laporkan pasangan dengan Jaccard shingle >= 10%
+PLAGIARISM_COLLUSION_MIN_CONTAINMENT = 0.5  # ... atau >= 50% shingle dokumen terkecil ada di dokumen lain
+PLAGIARISM_COLLUSION_MAX_DF = 0.5           # abaikan shingle yang muncul di > 50% dokumen (soal/template)
+PLAGIARISM_COLLUSION_MAX_PAIRS = 100
+
+# Progress job: 'db' (kolom progress) atau 'cache' (CACHES['plagiarism'], DB hanya di tahap utama)
+PLAGIARISM_PROGRESS_BACKEND = 'db'
+PLAGIARISM_PROGRESS_INTERVAL = 1.0     # detik minimal antar update progress
+PLAGIARISM_PROGRESS_MIN_DELTA = 2      # kenaikan progress minimal (persen) per update
+
+# Status halaman cek plagiasi: stream SSE (fallback polling dengan ETag/304).
+# Setiap stream menahan satu thread web selama STREAM_SECONDS; matikan jika
+# server memakai worker sync dengan sedikit thread.
+PLAGIARISM_STATUS_STREAM = True
+PLAGIARISM_STATUS_STREAM_SECONDS = 55  # stream ditutup lalu disambung ulang oleh browser
+PLAGIARISM_STATUS_STREAM_POLL = 1.0    # detik antar cek versi status (cache, tanpa query DB)
+
+# Download laporan: None = dikirim Django (ETag + Range), 'accel' = nginx
+# X-Accel-Redirect, 'sendfile' = X-Sendfile (Apache/lighttpd). Lihat
+# apps/plagiarism/downloads.py untuk konfigurasi web server.
+PLAGIARISM_DOWNLOAD_OFFLOAD = None
+PLAGIARISM_DOWNLOAD_ACCEL_PREFIX = '/protected-media/'  # location internal nginx -> MEDIA_ROOT
+
+# Laporan PDF dirender saat pertama diunduh, di process pool terpisah
+PLAGIARISM_REPORT_WORKERS = 2           # jumlah proses render per proses web (0 = render di thread request)
+PLAGIARISM_REPORT_RENDER_TIMEOUT = 300  # detik
+
+# Cache bersama antar proses (web + worker): status, posisi antrian, progress.
+# Tabel database (dibuat oleh migrasi plagiarism 0007 / `createcachetable`);
+# bisa diganti Redis/Memcached jika tersedia. Hasil kalimat batch tidak
+# disimpan di sini, tetapi di tabel BatchSentenceResult.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'plagiarism': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'plagiarism_cache',
+        # Satu key status per user + satu key progress per job aktif
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 